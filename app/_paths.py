@@ -0,0 +1,7 @@
+from pathlib import Path
+
+# Project-level paths, resolved once for the whole app.
+ROOT_DIR = Path(__file__).resolve().parent.parent
+ENV_PATH = ROOT_DIR / '.env'
+TABLES_PATH = ROOT_DIR / 'notion_tables.json'
+LOG_DIR = ROOT_DIR / 'logs'
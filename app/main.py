@@ -1,44 +1,70 @@
 import asyncio
-import json
 import os
+import re
+import time
 from datetime import datetime
-from functools import lru_cache, partial
-from pathlib import Path
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
 
-import requests
-from fastapi import FastAPI
-from nicegui import context, ui
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
+from nicegui import ui
 from dotenv import load_dotenv
 
-from app.services.backfill_facilities import router as backfill_router
-from app.services.fetch_facilities import router as facilities_router
-from app.services.generate_lha import router as lha_router
-from app.services.preflight import run_preflight
-from app.services.process_locations import router as process_router
-from app.services.reprocess_locations import router as reprocess_router
+from app._paths import ENV_PATH
+from app.services import _workerpool
+from app.services._runner import output_listener
+from app.services._table_cache import load_table_map, table_keys
+from app.services._table_selection import TableRequest
+from app.services.backfill_facilities import backfill_facilities, router as backfill_router
+from app.services.fetch_facilities import fetch_facilities, router as facilities_router
+from app.services.generate_lha import generate_lha, router as lha_router
+from app.services.preflight import invalidate_preflight, run_preflight_async
+from app.services.process_locations import process_locations, router as process_router
+from app.services.reprocess_locations import reprocess_locations, router as reprocess_router
+from app.services.schemas import ScriptResponse
 
 # Load .env from project root
-env_path = Path(__file__).resolve().parent.parent / '.env'
-load_dotenv(env_path)
+load_dotenv(ENV_PATH)
 
 NOTION_TOKEN = os.getenv('NOTION_TOKEN')
 GOOGLE_MAPS_API_KEY = os.getenv('GOOGLE_MAPS_API_KEY')
 
-app = FastAPI(title='ATLSApp')
+app = FastAPI(title='ATLSApp', default_response_class=ORJSONResponse)
 app.include_router(process_router)
 app.include_router(reprocess_router)
 app.include_router(facilities_router)
 app.include_router(backfill_router)
 app.include_router(lha_router)
 
-_client_origins: Dict[int, str] = {}
-_origin_lock = asyncio.Lock()
+_HOST = os.getenv('ATLS_HOST', '127.0.0.1')
+_PORT = int(os.getenv('ATLS_PORT', '8000'))
+
+
+@app.on_event('shutdown')
+async def _shutdown_workers() -> None:
+  await _workerpool.shutdown()
+
+
+# UI jobs are dispatched straight to their route handlers in this process. The
+# UI builds these bodies itself, so they skip request validation.
+_LOCAL_ROUTES: Dict[str, Callable[[Dict[str, Any]], Awaitable[ScriptResponse]]] = {
+  '/api/process': lambda body: process_locations(TableRequest.model_construct(table_key=body.get('table_key'))),
+  '/api/reprocess': lambda body: reprocess_locations(TableRequest.model_construct(table_key=body.get('table_key'))),
+  '/api/facilities': lambda body: fetch_facilities(),
+  '/api/backfill': lambda body: backfill_facilities(),
+  '/api/lha': lambda body: generate_lha(),
+}
+
 _LAST_RUN: Dict[str, Dict[str, Any]] = {}
 _NOISE_PATTERNS = [
   'pkg_resources is deprecated',
   "RuntimeWarning: 'scripts.process_new_locations'",
 ]
+_STREAM_FLUSH_SECONDS = 0.25
+# Same ceiling the UI had when it called the API over HTTP.
+_JOB_TIMEOUT_SECONDS = 300
+_NOISE_RE = re.compile('|'.join(map(re.escape, _NOISE_PATTERNS)))
 
 
 def _filter_noise(text: Optional[str]) -> Optional[str]:
@@ -46,14 +72,20 @@ def _filter_noise(text: Optional[str]) -> Optional[str]:
     return None
   lines = [
     line for line in text.splitlines()
-    if line and not any(pattern in line for pattern in _NOISE_PATTERNS)
+    if line and not _NOISE_RE.search(line)
   ]
   return '\n'.join(lines).strip() or None
 
 
+def _flush(log_area, *lines: str) -> None:
+  """Push several log lines as a single UI update."""
+  if lines:
+    log_area.push('\n'.join(lines))
+
+
 def _record_last_run(key: str, *, success: bool, message: Optional[str]) -> None:
   _LAST_RUN[key] = {
-    'timestamp': datetime.now(),
+    'ts': time.time(),
     'success': success,
     'message': message or '',
   }
@@ -63,38 +95,35 @@ def _format_last_run(key: str) -> str:
   info = _LAST_RUN.get(key)
   if not info:
     return 'Last run: never'
-  ts = info['timestamp'].strftime('%Y-%m-%d %H:%M:%S')
-  status = 'success' if info['success'] else 'failed'
-  summary = info['message'].splitlines()[0] if info['message'] else ''
-  suffix = f": {summary}" if summary else ''
-  return f'Last run ({status}) at {ts}{suffix}'
-
+  message = info['message']
+  summary = message.splitlines()[0] if message else ''
+  return _render_last_run(info['ts'], info['success'], summary)
 
-async def _get_client_origin() -> str:
-  client = context.client
-  if client.id in _client_origins:
-    return _client_origins[client.id]
 
-  async with _origin_lock:
-    if client.id in _client_origins:
-      return _client_origins[client.id]
-
-    origin = await ui.run_javascript('return window.location.origin')
-    _client_origins[client.id] = origin
-    return origin
+@lru_cache(maxsize=32)
+def _render_last_run(ts: float, success: bool, summary: str) -> str:
+  # Keyed on the first output line only, so cached labels never pin full job output.
+  stamp = datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S')
+  status = 'success' if success else 'failed'
+  suffix = f": {summary}" if summary else ''
+  return f'Last run ({status}) at {stamp}{suffix}'
 
 
-async def _call_api(
-  path: str,
-  *,
-  method: str = 'POST',
-  json: Optional[Dict[str, Any]] = None,
-  timeout: float = 300,
-) -> requests.Response:
-  origin = await _get_client_origin()
-  url = f'{origin}{path}'
-  request_fn = partial(requests.request, method, url, json=json, timeout=timeout)
-  return await asyncio.to_thread(request_fn)
+async def _invoke_local(path: str, body: Optional[Dict[str, Any]]) -> Tuple[int, Dict[str, Any]]:
+  """Run an in-process route handler and return `(status_code, payload)` like the API would."""
+  try:
+    # The run itself is shielded in the runner, so a timeout only stops waiting for it.
+    result = await asyncio.wait_for(_LOCAL_ROUTES[path](body or {}), _JOB_TIMEOUT_SECONDS)
+  except HTTPException as exc:
+    return exc.status_code, {'detail': exc.detail}
+  except asyncio.TimeoutError:
+    return 504, {'detail': f'{path} did not finish within {_JOB_TIMEOUT_SECONDS} seconds.'}
+  return 200, {
+    'success': result.success,
+    'returncode': result.returncode,
+    'stdout': result.stdout,
+    'stderr': result.stderr,
+  }
 
 
 async def _execute_job(
@@ -112,7 +141,7 @@ async def _execute_job(
   check_tables: bool,
   json_payload: Optional[Dict[str, Any]] = None,
 ) -> None:
-  issues = run_preflight(check_tables=check_tables)
+  issues = await run_preflight_async(check_tables=check_tables)
   if issues:
     message = '\n'.join(issues)
     status_label.text = message
@@ -126,20 +155,51 @@ async def _execute_job(
   ui.notify(start_toast, type='warning')
   log_area.push(f'Started: {start_toast}')
 
+  # Streamed script output is pushed at most every _STREAM_FLUSH_SECONDS; a
+  # timer pushes lines that are followed by silence, and whatever is still
+  # pending goes out together with the final status line.
+  pending: List[str] = []
   try:
-    response = await _call_api(path, json=json_payload)
-
+    streamed = False
+    last_flush = time.monotonic()
+    flush_timer: Optional[asyncio.TimerHandle] = None
+
+    def _flush_pending() -> None:
+      nonlocal last_flush, flush_timer
+      flush_timer = None
+      _flush(log_area, *pending)
+      pending.clear()
+      last_flush = time.monotonic()
+
+    async def _forward(line: str) -> None:
+      nonlocal streamed, flush_timer
+      if not _filter_noise(line):
+        return
+      streamed = True
+      pending.append(line)
+      wait = _STREAM_FLUSH_SECONDS - (time.monotonic() - last_flush)
+      if wait <= 0:
+        if flush_timer is not None:
+          flush_timer.cancel()
+        _flush_pending()
+      elif flush_timer is None:
+        flush_timer = asyncio.get_running_loop().call_later(wait, _flush_pending)
+
+    token = output_listener.set(_forward)
     try:
-      payload = response.json()
-    except ValueError:
-      payload = {}
+      status_code, payload = await _invoke_local(path, json_payload)
+    finally:
+      output_listener.reset(token)
+      if flush_timer is not None:
+        flush_timer.cancel()
 
-    print(f'API call to {path} -> status={response.status_code}, payload={payload}')
+    print(f'API call to {path} -> status={status_code}, payload={payload}')
 
-    if response.ok and payload.get('success'):
+    if 200 <= status_code < 300 and payload.get('success'):
       message = _filter_noise(payload.get('stdout')) or default_success_detail
       status_label.text = message
-      log_area.push(f'Success: {message}')
+      # Output already streamed into the log; don't repeat it there.
+      _flush(log_area, *pending, f'Success: {default_success_detail if streamed else message}')
       ui.notify(success_toast, type='positive')
       _record_last_run(job_key, success=True, message=message)
     else:
@@ -147,32 +207,26 @@ async def _execute_job(
         payload.get('detail')
         or payload.get('stderr')
         or payload.get('stdout')
-        or response.text
       ) or 'Unknown error.'
       status_label.text = detail
-      log_area.push(f'Failure: {detail}')
+      _flush(log_area, *pending, f'Failure: {detail}')
       ui.notify(failure_toast, type='negative')
       _record_last_run(job_key, success=False, message=detail)
   except Exception as exc:  # pragma: no cover - guardrail
     status_label.text = str(exc)
-    log_area.push(f'Error: {exc}')
+    _flush(log_area, *pending, f'Error: {exc}')
     ui.notify(f'{failure_toast}: {exc}', type='negative')
     _record_last_run(job_key, success=False, message=str(exc))
   finally:
     last_run_label.text = _format_last_run(job_key)
 
 
-@lru_cache(maxsize=1)
 def _load_production_options() -> List[str]:
-  data_path = Path(__file__).resolve().parent.parent / 'notion_tables.json'
   try:
-    with data_path.open('r', encoding='utf-8') as handle:
-      data = json.load(handle)
-    if isinstance(data, dict):
-      return list(data.keys())
+    data = load_table_map()
   except FileNotFoundError:
     return []
-  return []
+  return list(table_keys(data)) if isinstance(data, Mapping) else []
 
 # Sidebar layout and placeholder pages
 @ui.page('/')
@@ -190,161 +244,124 @@ def index_page():
     ui.label(f'Notion token loaded: {"Yes" if NOTION_TOKEN else "No"}')
     ui.label(f'Google Maps key loaded: {"Yes" if GOOGLE_MAPS_API_KEY else "No"}')
 
-@ui.page('/process')
-def process_page():
-  ui.label('Process Locations')
-
-  with ui.card().classes('w-full max-w-xl gap-2'):
-    status_label = ui.label('Idle').classes('text-sm text-gray-500 whitespace-pre-wrap')
-    log_area = ui.log(max_lines=50).classes('w-full max-h-48')
-    options = _load_production_options()
-    table_select = ui.select(
-      options,
-      value=options[0] if options else None,
-      label='Production',
-    ).classes('w-full').props('outlined') if options else None
-    last_run_label = ui.label(_format_last_run('/api/process')).classes('text-xs text-gray-500')
-
-  async def trigger_process() -> None:
-    if table_select is None or not table_select.value:
-      status_label.text = 'No productions available.'
-      log_area.push('Failure: No productions available.')
-      ui.notify('No productions available to process', type='negative')
-      return
-
-    await _execute_job(
-      path='/api/process',
-      job_key='/api/process',
-      status_label=status_label,
-      log_area=log_area,
-      last_run_label=last_run_label,
-      running_status='Processing locations...',
-      start_toast='Processing started...',
-      success_toast='Process locations completed',
-      default_success_detail='Process completed successfully.',
-      failure_toast='Process locations failed',
-      check_tables=True,
-      json_payload={'table_key': table_select.value},
-    )
-
-  ui.button('Run', on_click=trigger_process)
-
-@ui.page('/reprocess')
-def reprocess_page():
-  ui.label('Reprocess Locations')
-
-  with ui.card().classes('w-full max-w-xl gap-2'):
-    status_label = ui.label('Idle').classes('text-sm text-gray-500 whitespace-pre-wrap')
-    log_area = ui.log(max_lines=50).classes('w-full max-h-48')
-    options = _load_production_options()
-    table_select = ui.select(
-      options,
-      value=options[0] if options else None,
-      label='Production',
-    ).classes('w-full').props('outlined') if options else None
-    last_run_label = ui.label(_format_last_run('/api/reprocess')).classes('text-xs text-gray-500')
-
-  async def trigger_reprocess() -> None:
-    if table_select is None or not table_select.value:
-      status_label.text = 'No productions available.'
-      log_area.push('Failure: No productions available.')
-      ui.notify('No productions available to reprocess', type='negative')
-      return
-
-    await _execute_job(
-      path='/api/reprocess',
-      job_key='/api/reprocess',
-      status_label=status_label,
-      log_area=log_area,
-      last_run_label=last_run_label,
-      running_status='Reprocessing all locations...',
-      start_toast='Reprocess started...',
-      success_toast='Reprocess completed',
-      default_success_detail='Reprocess completed successfully.',
-      failure_toast='Reprocess failed',
-      check_tables=True,
-      json_payload={'table_key': table_select.value},
-    )
-
-  ui.button('Run', on_click=trigger_reprocess)
-
-@ui.page('/facilities')
-def facilities_page():
-  ui.label('Fetch Nearby Medical Facilities')
-
-  with ui.card().classes('w-full max-w-xl gap-2'):
-    status_label = ui.label('Idle').classes('text-sm text-gray-500 whitespace-pre-wrap')
-    log_area = ui.log(max_lines=50).classes('w-full max-h-48')
-    last_run_label = ui.label(_format_last_run('/api/facilities')).classes('text-xs text-gray-500')
-
-  async def trigger_facilities() -> None:
-    await _execute_job(
-      path='/api/facilities',
-      job_key='/api/facilities',
-      status_label=status_label,
-      log_area=log_area,
-      last_run_label=last_run_label,
-      running_status='Fetching nearby medical facilities...',
-      start_toast='Facility fetch started...',
-      success_toast='Facility fetch completed',
-      default_success_detail='Facility fetch completed successfully.',
-      failure_toast='Facility fetch failed',
-      check_tables=True,
-    )
-
-  ui.button('Run', on_click=trigger_facilities)
-
-@ui.page('/backfill')
-def backfill_page():
-  ui.label('Backfill Facilities')
-
-  with ui.card().classes('w-full max-w-xl gap-2'):
-    status_label = ui.label('Idle').classes('text-sm text-gray-500 whitespace-pre-wrap')
-    log_area = ui.log(max_lines=50).classes('w-full max-h-48')
-    last_run_label = ui.label(_format_last_run('/api/backfill')).classes('text-xs text-gray-500')
-
-  async def trigger_backfill() -> None:
-    await _execute_job(
-      path='/api/backfill',
-      job_key='/api/backfill',
-      status_label=status_label,
-      log_area=log_area,
-      last_run_label=last_run_label,
-      running_status='Backfilling facility details...',
-      start_toast='Backfill started...',
-      success_toast='Backfill completed',
-      default_success_detail='Backfill completed successfully.',
-      failure_toast='Backfill failed',
-      check_tables=True,
-    )
-
-  ui.button('Run', on_click=trigger_backfill)
-
-@ui.page('/lha')
-def lha_page():
-  ui.label('Generate LHA')
-
-  with ui.card().classes('w-full max-w-xl gap-2'):
-    status_label = ui.label('Idle').classes('text-sm text-gray-500 whitespace-pre-wrap')
-    log_area = ui.log(max_lines=50).classes('w-full max-h-48')
-    last_run_label = ui.label(_format_last_run('/api/lha')).classes('text-xs text-gray-500')
-
-  async def trigger_lha() -> None:
-    await _execute_job(
-      path='/api/lha',
-      job_key='/api/lha',
-      status_label=status_label,
-      log_area=log_area,
-      last_run_label=last_run_label,
-      running_status='Generating LHA forms...',
-      start_toast='LHA generation started...',
-      success_toast='LHA generation completed',
-      default_success_detail='LHA generation completed successfully.',
-      failure_toast='LHA generation failed',
-      check_tables=True,
-    )
-
-  ui.button('Run', on_click=trigger_lha)
+def _register_job_page(
+  route: str,
+  *,
+  title: str,
+  api_path: str,
+  running_status: str,
+  start_toast: str,
+  success_toast: str,
+  default_success_detail: str,
+  failure_toast: str,
+  empty_notice: Optional[str] = None,
+) -> None:
+  """Register a job card page; `empty_notice` adds the production picker."""
+  select_production = empty_notice is not None
+
+  @ui.page(route)
+  def job_page():
+    ui.label(title)
+
+    with ui.card().classes('w-full max-w-xl gap-2'):
+      status_label = ui.label('Idle').classes('text-sm text-gray-500 whitespace-pre-wrap')
+      log_area = ui.log(max_lines=50).classes('w-full max-h-48')
+      table_select = None
+      if select_production:
+        options = _load_production_options()
+        table_select = ui.select(
+          options,
+          value=options[0] if options else None,
+          label='Production',
+          on_change=lambda _: invalidate_preflight(),
+        ).classes('w-full').props('outlined') if options else None
+      last_run_label = ui.label(_format_last_run(api_path)).classes('text-xs text-gray-500')
+
+    async def trigger() -> None:
+      json_payload = None
+      if select_production:
+        if table_select is None or not table_select.value:
+          status_label.text = 'No productions available.'
+          log_area.push('Failure: No productions available.')
+          ui.notify(empty_notice, type='negative')
+          return
+        json_payload = {'table_key': table_select.value}
+
+      await _execute_job(
+        path=api_path,
+        job_key=api_path,
+        status_label=status_label,
+        log_area=log_area,
+        last_run_label=last_run_label,
+        running_status=running_status,
+        start_toast=start_toast,
+        success_toast=success_toast,
+        default_success_detail=default_success_detail,
+        failure_toast=failure_toast,
+        check_tables=True,
+        json_payload=json_payload,
+      )
+
+    ui.button('Run', on_click=trigger)
+
+
+_JOB_PAGES = (
+  dict(
+    route='/process',
+    title='Process Locations',
+    api_path='/api/process',
+    running_status='Processing locations...',
+    start_toast='Processing started...',
+    success_toast='Process locations completed',
+    default_success_detail='Process completed successfully.',
+    failure_toast='Process locations failed',
+    empty_notice='No productions available to process',
+  ),
+  dict(
+    route='/reprocess',
+    title='Reprocess Locations',
+    api_path='/api/reprocess',
+    running_status='Reprocessing all locations...',
+    start_toast='Reprocess started...',
+    success_toast='Reprocess completed',
+    default_success_detail='Reprocess completed successfully.',
+    failure_toast='Reprocess failed',
+    empty_notice='No productions available to reprocess',
+  ),
+  dict(
+    route='/facilities',
+    title='Fetch Nearby Medical Facilities',
+    api_path='/api/facilities',
+    running_status='Fetching nearby medical facilities...',
+    start_toast='Facility fetch started...',
+    success_toast='Facility fetch completed',
+    default_success_detail='Facility fetch completed successfully.',
+    failure_toast='Facility fetch failed',
+  ),
+  dict(
+    route='/backfill',
+    title='Backfill Facilities',
+    api_path='/api/backfill',
+    running_status='Backfilling facility details...',
+    start_toast='Backfill started...',
+    success_toast='Backfill completed',
+    default_success_detail='Backfill completed successfully.',
+    failure_toast='Backfill failed',
+  ),
+  dict(
+    route='/lha',
+    title='Generate LHA',
+    api_path='/api/lha',
+    running_status='Generating LHA forms...',
+    start_toast='LHA generation started...',
+    success_toast='LHA generation completed',
+    default_success_detail='LHA generation completed successfully.',
+    failure_toast='LHA generation failed',
+  ),
+)
+
+for _spec in _JOB_PAGES:
+  _register_job_page(**_spec)
 
 @ui.page('/logs')
 def logs_page():
@@ -352,3 +369,17 @@ def logs_page():
   ui.label('Check /logs folder for CSVs and output')
 
 ui.run_with(app)
+
+if __name__ == '__main__':
+  import uvicorn
+
+  # Job state (_LAST_RUN, in-flight runs, warm workers) lives in this process,
+  # so the app must run as a single Uvicorn worker. `auto` picks uvloop and
+  # httptools when they are installed and falls back on platforms without them.
+  uvicorn.run(
+    app,
+    host=_HOST,
+    port=_PORT,
+    loop='auto',
+    http='auto',
+  )
@@ -3,25 +3,92 @@ import logging
 import os
 import subprocess
 import sys
-from datetime import datetime
-from pathlib import Path
-from typing import Mapping, Optional, Sequence
+import time
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
 
+from app._paths import LOG_DIR, ROOT_DIR
+from app.services import _workerpool
 from app.services.schemas import ScriptResponse
 
-_ROOT_DIR = Path(__file__).resolve().parent.parent.parent
-_LOG_DIR = _ROOT_DIR / 'logs'
-_LOG_DIR.mkdir(exist_ok=True)
-_RUNNER_LOG = _LOG_DIR / 'jobs.log'
+LOG_DIR.mkdir(exist_ok=True)
+_RUNNER_LOG = LOG_DIR / 'jobs.log'
+_SCRIPTS_DIR = ROOT_DIR / 'scripts'
+_PYTHON = sys.executable
 
 logger = logging.getLogger('services.runner')
 logger.setLevel(logging.INFO)
 if not logger.handlers:
-    handler = logging.FileHandler(_RUNNER_LOG, encoding='utf-8')
+    # One record per job, so writes stay unbuffered (entries show up as soon as a
+    # run finishes); rotation keeps the file from growing without bound.
+    handler = RotatingFileHandler(_RUNNER_LOG, maxBytes=10 * 1024 * 1024, backupCount=3, encoding='utf-8')
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     handler.setFormatter(formatter)
     logger.addHandler(handler)
 
+LineCallback = Callable[[str], Awaitable[None]]
+
+# Lets in-process callers (the NiceGUI pages) receive stdout lines without
+# threading a callback through every route handler signature.
+output_listener: ContextVar[Optional[LineCallback]] = ContextVar('output_listener', default=None)
+
+# Environment passed to every script, snapshotted on first use (after the app
+# has loaded .env). Scripts re-read .env themselves via Config.setup().
+_BASE_ENV: Optional[Dict[str, str]] = None
+
+
+def _base_env() -> Dict[str, str]:
+    global _BASE_ENV
+    if _BASE_ENV is None:
+        env = dict(os.environ)
+        env.setdefault('PYTHONUTF8', '1')
+        _BASE_ENV = env
+    return _BASE_ENV
+
+
+# Identical runs that overlap share one subprocess; keyed by the full invocation.
+_INFLIGHT: Dict[Tuple, 'asyncio.Task[ScriptResponse]'] = {}
+
+
+# Child output is read in chunks of up to this size; also the longest stdout
+# line forwarded in one piece (longer lines are passed on in parts).
+_STREAM_LIMIT = 1024 * 1024
+
+
+async def _pump_lines(
+    stream: asyncio.StreamReader,
+    chunks: List[bytes],
+    forward: Optional[LineCallback],
+) -> None:
+    while True:
+        try:
+            line = await stream.readuntil(b'\n')
+        except asyncio.IncompleteReadError as exc:
+            line = exc.partial  # EOF, possibly after an unterminated last line
+        except asyncio.LimitOverrunError as exc:
+            line = await stream.readexactly(exc.consumed)
+        if not line:
+            return
+        chunks.append(line)
+        if forward is not None:
+            try:
+                await forward(line.decode('utf-8', errors='replace').rstrip('\r\n'))
+            except Exception:  # noqa: BLE001
+                # Streaming is best-effort; a listener failure must not abort the script.
+                logger.exception('output listener failed; streaming stopped for this run')
+                forward = None
+
+
+async def _drain(stream: asyncio.StreamReader, chunks: List[bytes]) -> None:
+    # stderr carries tqdm's '\r' progress updates, which can run far past any
+    # line limit before a newline arrives, so read it in plain chunks.
+    while True:
+        chunk = await stream.read(_STREAM_LIMIT)
+        if not chunk:
+            return
+        chunks.append(chunk)
+
 
 async def run_script(
     script_name: str,
@@ -29,22 +96,64 @@ async def run_script(
     *,
     input_data: Optional[str] = None,
     env_overrides: Optional[Mapping[str, str]] = None,
+    on_line: Optional[LineCallback] = None,
 ) -> ScriptResponse:
-    script_path = _ROOT_DIR / 'scripts' / script_name
+    """
+    Run `scripts/<script_name>`, joining an identical run if one is already in flight.
+
+    `on_line` (or the current `output_listener`) receives each stdout line as it
+    is produced; callers that join an existing run only get the final response.
+    """
+    key = (script_name, tuple(args), input_data, frozenset((env_overrides or {}).items()))
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(
+            _run_script(
+                script_name,
+                args,
+                input_data=input_data,
+                env_overrides=env_overrides,
+                on_line=on_line or output_listener.get(),
+            )
+        )
+        _INFLIGHT[key] = task
+        task.add_done_callback(lambda _: _INFLIGHT.pop(key, None))
+    # Shield so one caller disconnecting does not cancel the run for the others.
+    return await asyncio.shield(task)
+
+
+async def _run_script(
+    script_name: str,
+    args: Sequence[str] = (),
+    *,
+    input_data: Optional[str] = None,
+    env_overrides: Optional[Mapping[str, str]] = None,
+    on_line: Optional[LineCallback] = None,
+) -> ScriptResponse:
+    script_path = _SCRIPTS_DIR / script_name
     if not script_path.exists():
         raise FileNotFoundError(script_path)
 
     module_name = f'scripts.{script_path.stem}'
-    start_time = datetime.utcnow()
+    start_ns = time.perf_counter_ns()
+
+    env = {**_base_env(), **env_overrides} if env_overrides else _base_env()
 
-    env = os.environ.copy()
-    env.setdefault('PYTHONUTF8', '1')
-    if env_overrides:
-        env.update(env_overrides)
+    pooled = await _workerpool.run(
+        module_name,
+        args,
+        input_data=input_data,
+        env=env,
+        env_overrides=env_overrides,
+        on_line=on_line,
+    )
+    if pooled is not None:
+        returncode, stdout_bytes, stderr_bytes = pooled
+        return _finish(module_name, args, returncode, stdout_bytes, stderr_bytes, start_ns)
 
     try:
         process = await asyncio.create_subprocess_exec(
-            sys.executable,
+            _PYTHON,
             '-m',
             module_name,
             *args,
@@ -52,16 +161,36 @@ async def run_script(
             stderr=asyncio.subprocess.PIPE,
             stdin=asyncio.subprocess.PIPE if input_data is not None else None,
             env=env,
+            limit=_STREAM_LIMIT,
         )
 
-        stdout_bytes, stderr_bytes = await process.communicate(
-            input_data.encode('utf-8') if input_data is not None else None
-        )
-        returncode = process.returncode
+        if input_data is not None:
+            try:
+                process.stdin.write(input_data.encode('utf-8'))
+                await process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            process.stdin.close()
+
+        stdout_chunks: List[bytes] = []
+        stderr_chunks: List[bytes] = []
+        try:
+            await asyncio.gather(
+                _pump_lines(process.stdout, stdout_chunks, on_line),
+                _drain(process.stderr, stderr_chunks),
+            )
+        except BaseException:
+            # Don't leave the child running against pipes nobody reads any more.
+            if process.returncode is None:
+                process.kill()
+            raise
+        returncode = await process.wait()
+        stdout_bytes = b''.join(stdout_chunks)
+        stderr_bytes = b''.join(stderr_chunks)
     except NotImplementedError:
         def _run_sync() -> subprocess.CompletedProcess[bytes]:
             return subprocess.run(
-                [sys.executable, '-m', module_name, *args],
+                [_PYTHON, '-m', module_name, *args],
                 input=input_data.encode('utf-8') if input_data is not None else None,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
@@ -73,14 +202,26 @@ async def run_script(
         stderr_bytes = completed.stderr
         returncode = completed.returncode
 
-    stdout_text = stdout_bytes.decode('utf-8', errors='replace')
-    stderr_text = stderr_bytes.decode('utf-8', errors='replace')
+    return _finish(module_name, args, returncode, stdout_bytes, stderr_bytes, start_ns)
+
 
-    response = ScriptResponse(
+def _finish(
+    module_name: str,
+    args: Sequence[str],
+    returncode: int,
+    stdout_bytes: bytes,
+    stderr_bytes: bytes,
+    start_ns: int,
+) -> ScriptResponse:
+    # Decode before stripping: str.strip() also removes Unicode whitespace (NBSP, U+3000).
+    stdout = stdout_bytes.decode('utf-8', errors='replace').strip()
+    stderr = stderr_bytes.decode('utf-8', errors='replace').strip()
+
+    response = ScriptResponse.model_construct(
         success=returncode == 0,
         returncode=returncode,
-        stdout=stdout_text.strip() or None,
-        stderr=stderr_text.strip() or None,
+        stdout=stdout or None,
+        stderr=stderr or None,
     )
 
     logger.info(
@@ -88,9 +229,13 @@ async def run_script(
         module_name,
         ' '.join(args),
         response.returncode,
-        (datetime.utcnow() - start_time).total_seconds(),
-        (response.stdout or '').replace('\n', '\\n')[:2000],
-        (response.stderr or '').replace('\n', '\\n')[:2000],
+        (time.perf_counter_ns() - start_ns) / 1e9,
+        _log_excerpt(stdout),
+        _log_excerpt(stderr),
     )
 
     return response
+
+
+def _log_excerpt(text: str, limit: int = 2000) -> str:
+    return text[:limit].replace('\n', '\\n')
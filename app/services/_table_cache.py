@@ -0,0 +1,92 @@
+import os
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple
+
+import orjson
+
+from app._paths import TABLES_PATH
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+class _Snapshot(NamedTuple):
+    mtime: Optional[int]
+    data: Any
+    keys: Tuple[str, ...]
+    index: Mapping[str, int]
+    aliases: Mapping[str, str]
+
+
+# Replaced wholesale on reload (the preflight thread reloads while the event loop
+# reads), so readers always see one consistent file version.
+_SNAPSHOT = _Snapshot(None, None, (), _EMPTY, _EMPTY)
+
+
+def load_table_map() -> Any:
+    """
+    Return the parsed `notion_tables.json`, re-reading it only when its mtime changes.
+
+    A JSON object comes back as a read-only mapping shared by every caller.
+    Raises FileNotFoundError if the file is missing and orjson.JSONDecodeError
+    (a ValueError) if it is malformed.
+    """
+    global _SNAPSHOT
+    mtime_ns = os.stat(TABLES_PATH).st_mtime_ns
+    snapshot = _SNAPSHOT
+    if snapshot.mtime != mtime_ns:
+        raw = orjson.loads(TABLES_PATH.read_bytes())
+        if isinstance(raw, dict):
+            snapshot = _Snapshot(
+                mtime_ns,
+                MappingProxyType(raw),
+                tuple(raw),
+                MappingProxyType({key: position for position, key in enumerate(raw, start=1)}),
+                MappingProxyType(_build_aliases(raw)),
+            )
+        else:
+            snapshot = _Snapshot(mtime_ns, raw, (), _EMPTY, _EMPTY)
+        _SNAPSHOT = snapshot
+    return snapshot.data
+
+
+def normalize_table_key(key: str) -> str:
+    """Case- and whitespace-insensitive form of a production key."""
+    return key.strip().casefold()
+
+
+def _build_aliases(table_map: Mapping[str, str]) -> Dict[str, str]:
+    # First key wins if two keys only differ by case.
+    aliases: Dict[str, str] = {}
+    for key in table_map:
+        aliases.setdefault(normalize_table_key(key), key)
+    return aliases
+
+
+def _snapshot_for(table_map: Mapping[str, str]) -> Optional[_Snapshot]:
+    # Derived views are only reused when they were built from this exact mapping.
+    snapshot = _SNAPSHOT
+    return snapshot if table_map is snapshot.data else None
+
+
+def table_keys(table_map: Mapping[str, str]) -> Tuple[str, ...]:
+    """Production keys of `table_map` in file order."""
+    snapshot = _snapshot_for(table_map)
+    if snapshot is not None:
+        return snapshot.keys
+    return tuple(table_map)
+
+
+def table_positions(table_map: Mapping[str, str]) -> Mapping[str, int]:
+    """Map each production key of `table_map` to its 1-based menu position."""
+    snapshot = _snapshot_for(table_map)
+    if snapshot is not None:
+        return snapshot.index
+    return {key: position for position, key in enumerate(table_map, start=1)}
+
+
+def table_aliases(table_map: Mapping[str, str]) -> Mapping[str, str]:
+    """Map each normalized production key of `table_map` to the key as written in the file."""
+    snapshot = _snapshot_for(table_map)
+    if snapshot is not None:
+        return snapshot.aliases
+    return _build_aliases(table_map)
@@ -0,0 +1,52 @@
+from typing import Mapping, Optional, Tuple
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from app.services._table_cache import load_table_map, normalize_table_key, table_aliases, table_positions
+
+
+class TableRequest(BaseModel):
+    table_key: Optional[str] = None
+
+
+def require_table_map() -> Mapping[str, str]:
+    try:
+        data = load_table_map()
+    except FileNotFoundError as exc:
+        raise HTTPException(
+            status_code=400,
+            detail='notion_tables.json not found. Run sync_prod_tables first.',
+        ) from exc
+
+    if not isinstance(data, Mapping) or not data:
+        raise HTTPException(
+            status_code=400,
+            detail='notion_tables.json is empty or malformed.',
+        )
+    return data
+
+
+def resolve_selection(table_map: Mapping[str, str], requested_key: Optional[str]) -> Tuple[str, int]:
+    """
+    Return the selected production key and its 1-based menu position.
+
+    Keys match exactly first, then ignoring case and surrounding whitespace.
+    """
+    if not table_map:
+        raise HTTPException(
+            status_code=400,
+            detail='No productions available in notion_tables.json.',
+        )
+    if not requested_key:
+        return next(iter(table_map)), 1
+    positions = table_positions(table_map)
+    key = requested_key
+    if key not in positions:
+        key = table_aliases(table_map).get(normalize_table_key(requested_key))
+    if key is not None:
+        return key, positions[key]
+    raise HTTPException(
+        status_code=400,
+        detail=f"Unknown production '{requested_key}'.",
+    )
@@ -0,0 +1,165 @@
+import asyncio
+import json
+import logging
+import os
+import sys
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+logger = logging.getLogger('services.runner')
+
+# Set ATLS_WORKER_POOL=0 to always launch a fresh interpreter per job.
+_ENABLED = os.getenv('ATLS_WORKER_POOL', '1') != '0'
+# Frames carry whole stdout lines; allow large ones.
+_STREAM_LIMIT = 16 * 1024 * 1024
+
+LineCallback = Callable[[str], Awaitable[None]]
+WorkerResult = Tuple[int, bytes, bytes]
+
+
+class WorkerProc:
+    """A warm `scripts.worker_host` process that runs one job at a time."""
+
+    def __init__(self, env: Mapping[str, str], env_key: frozenset) -> None:
+        self.env = env
+        self.env_key = env_key
+        self.lock = asyncio.Lock()
+        self._process: Optional[asyncio.subprocess.Process] = None
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def start(self) -> None:
+        self._process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            '-u',
+            '-m',
+            'scripts.worker_host',
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            env=self.env,
+            limit=_STREAM_LIMIT,
+        )
+
+    async def run(
+        self,
+        module_name: str,
+        args: Sequence[str],
+        input_data: Optional[str],
+        on_line: Optional[LineCallback],
+    ) -> Optional[WorkerResult]:
+        """Run one job; returns None if the worker could not accept it."""
+        job = {'module': module_name, 'args': list(args), 'input': input_data}
+        try:
+            self._process.stdin.write(json.dumps(job).encode('utf-8') + b'\n')
+            await self._process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            return None
+
+        stdout_chunks: List[bytes] = []
+        stderr_chunks: List[bytes] = []
+        try:
+            return await self._read_result(stdout_chunks, stderr_chunks, on_line)
+        except BaseException:
+            # Frames from this job may still be unread; a later job must not see
+            # them (or this job's `done`) as its own, so discard the worker.
+            self.kill()
+            raise
+
+    async def _read_result(
+        self,
+        stdout_chunks: List[bytes],
+        stderr_chunks: List[bytes],
+        on_line: Optional[LineCallback],
+    ) -> WorkerResult:
+        while True:
+            raw = await self._process.stdout.readline()
+            if not raw:
+                # The job may have had side effects already, so report the crash
+                # instead of silently re-running it.
+                await self._process.wait()
+                stderr_chunks.append(b'\nWorker process exited unexpectedly.')
+                return 1, b''.join(stdout_chunks), b''.join(stderr_chunks)
+
+            frame = json.loads(raw)
+            if 'done' in frame:
+                return frame['done'], b''.join(stdout_chunks), b''.join(stderr_chunks)
+            if 'out' in frame:
+                text = frame['out']
+                stdout_chunks.append(text.encode('utf-8'))
+                if on_line is not None:
+                    try:
+                        for line in text.splitlines():
+                            await on_line(line)
+                    except Exception:  # noqa: BLE001
+                        # Streaming is best-effort; keep reading this job's frames.
+                        logger.exception('output listener failed; streaming stopped for this job')
+                        on_line = None
+            elif 'err' in frame:
+                stderr_chunks.append(frame['err'].encode('utf-8'))
+
+    def kill(self) -> None:
+        if self.alive:
+            self._process.kill()
+        self._process = None
+
+    async def stop(self) -> None:
+        if self.alive:
+            self._process.stdin.close()
+            try:
+                await asyncio.wait_for(self._process.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                self._process.kill()
+
+
+_WORKERS: Dict[str, WorkerProc] = {}
+
+
+async def run(
+    module_name: str,
+    args: Sequence[str],
+    *,
+    input_data: Optional[str],
+    env: Mapping[str, str],
+    env_overrides: Optional[Mapping[str, str]],
+    on_line: Optional[LineCallback],
+) -> Optional[WorkerResult]:
+    """
+    Run `module_name` in its warm worker, spawning it on first use.
+
+    Returns None when the caller should fall back to a fresh subprocess: the
+    pool is disabled, the worker is busy with another job, or it failed to start.
+    """
+    if not _ENABLED:
+        return None
+
+    env_key = frozenset((env_overrides or {}).items())
+    worker = _WORKERS.get(module_name)
+    if worker is None or worker.env_key != env_key:
+        if worker is not None:
+            asyncio.ensure_future(_retire(worker))
+        worker = WorkerProc(env, env_key)
+        _WORKERS[module_name] = worker
+    if worker.lock.locked():
+        return None
+
+    async with worker.lock:
+        if not worker.alive:
+            try:
+                await worker.start()
+            except (OSError, NotImplementedError) as exc:
+                logger.warning('worker for %s failed to start: %s', module_name, exc)
+                return None
+        return await worker.run(module_name, args, input_data, on_line)
+
+
+async def _retire(worker: WorkerProc) -> None:
+    # Let a running job finish before closing the worker's job channel.
+    async with worker.lock:
+        await worker.stop()
+
+
+async def shutdown() -> None:
+    workers = list(_WORKERS.values())
+    _WORKERS.clear()
+    await asyncio.gather(*(worker.stop() for worker in workers))
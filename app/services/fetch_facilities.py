@@ -1,16 +1,16 @@
 from fastapi import APIRouter, HTTPException
 
 from app.services._runner import run_script
-from app.services.preflight import run_preflight
+from app.services.preflight import run_preflight_async
 from app.services.schemas import ScriptResponse
 
 router = APIRouter(prefix='/api', tags=['facilities'])
 
 
-@router.post('/facilities', response_model=ScriptResponse)
+@router.post('/facilities', response_model=ScriptResponse, response_model_exclude_none=True)
 async def fetch_facilities() -> ScriptResponse:
     try:
-        issues = run_preflight(check_tables=True)
+        issues = await run_preflight_async(check_tables=True)
         if issues:
             raise HTTPException(status_code=400, detail='; '.join(issues))
 
@@ -19,13 +19,13 @@ async def fetch_facilities() -> ScriptResponse:
             args=('--dry-run',),
         )
     except FileNotFoundError:
-        return ScriptResponse(
+        return ScriptResponse.model_construct(
             success=False,
             returncode=127,
             stderr='fetch_medical_facilities.py not found in scripts/.',
         )
     except Exception as exc:  # pragma: no cover
-        return ScriptResponse(
+        return ScriptResponse.model_construct(
             success=False,
             returncode=1,
             stderr=f'{type(exc).__name__}: {exc}' or 'Unexpected error.',
@@ -1,16 +1,16 @@
 from fastapi import APIRouter, HTTPException
 
 from app.services._runner import run_script
-from app.services.preflight import run_preflight
+from app.services.preflight import run_preflight_async
 from app.services.schemas import ScriptResponse
 
 router = APIRouter(prefix='/api', tags=['lha'])
 
 
-@router.post('/lha', response_model=ScriptResponse)
+@router.post('/lha', response_model=ScriptResponse, response_model_exclude_none=True)
 async def generate_lha() -> ScriptResponse:
     try:
-        issues = run_preflight(check_tables=True)
+        issues = await run_preflight_async(check_tables=True)
         if issues:
             raise HTTPException(status_code=400, detail='; '.join(issues))
 
@@ -22,13 +22,13 @@ async def generate_lha() -> ScriptResponse:
             )
         return response
     except FileNotFoundError:
-        return ScriptResponse(
+        return ScriptResponse.model_construct(
             success=False,
             returncode=127,
             stderr='generate_lha_forms.py not found in scripts/.',
         )
     except Exception as exc:  # pragma: no cover
-        return ScriptResponse(
+        return ScriptResponse.model_construct(
             success=False,
             returncode=1,
             stderr=f'{type(exc).__name__}: {exc}' or 'Unexpected error.',
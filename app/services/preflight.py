@@ -1,18 +1,73 @@
-import json
+import asyncio
 import os
+import time
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Mapping, Optional, Tuple
 
+import orjson
+
+from app._paths import ENV_PATH, TABLES_PATH
+from app.services._table_cache import load_table_map
 from config import Config
 
-_ROOT_DIR = Path(__file__).resolve().parent.parent.parent
-_TABLES_PATH = _ROOT_DIR / 'notion_tables.json'
+# Results are reused until .env or notion_tables.json changes, re-checked at
+# least every _CACHE_TTL_SECONDS for changes the file stamps cannot see.
+_CACHE_TTL_SECONDS = 30.0
+_PREFLIGHT_CACHE: Dict[bool, Tuple[Tuple[Optional[int], Optional[int]], float, List[str]]] = {}
+# Shared "no issues" result handed out on the happy path; callers must not mutate it.
+_OK: List[str] = []
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def invalidate_preflight() -> None:
+    """Force the next `run_preflight` call to re-check everything."""
+    _PREFLIGHT_CACHE.clear()
+
+
+def _fingerprint() -> Tuple[Optional[int], Optional[int]]:
+    return _mtime_ns(TABLES_PATH), _mtime_ns(ENV_PATH)
+
+
+def cached_preflight(check_tables: bool = True) -> Optional[List[str]]:
+    """Return the cached issues if still valid, else None. Only stats two files."""
+    cached = _PREFLIGHT_CACHE.get(check_tables)
+    if cached and cached[0] == _fingerprint() and time.monotonic() < cached[1]:
+        return list(cached[2]) if cached[2] else _OK
+    return None
 
 
 def run_preflight(check_tables: bool = True) -> List[str]:
-    """Return a list of user-facing issues blocking script execution."""
-    Config.setup(force=True)
+    """
+    Return a list of user-facing issues blocking script execution.
+
+    An empty result is a shared list; treat it as read-only.
+    """
+    issues = cached_preflight(check_tables)
+    if issues is not None:
+        return issues
+
+    fingerprint = _fingerprint()
+    Config.setup()  # reloads only if .env changed
+    issues = _check(check_tables)
+    _PREFLIGHT_CACHE[check_tables] = (fingerprint, time.monotonic() + _CACHE_TTL_SECONDS, issues)
+    return list(issues) if issues else _OK
+
+
+async def run_preflight_async(check_tables: bool = True) -> List[str]:
+    """`run_preflight` for async callers; a cold check runs in a worker thread."""
+    issues = cached_preflight(check_tables)
+    if issues is None:
+        issues = await asyncio.to_thread(run_preflight, check_tables)
+    return issues
+
 
+def _check(check_tables: bool) -> List[str]:
     issues: List[str] = []
 
     if not Config.NOTION_TOKEN or not os.getenv('NOTION_TOKEN'):
@@ -27,15 +82,15 @@ def run_preflight(check_tables: bool = True) -> List[str]:
     if not Config.MEDICAL_FACILITIES_DB:
         issues.append('Missing MEDICAL_FACILITIES_DB in .env.')
 
-    if check_tables:
+    # The tables file can only be synced once .env is complete, so don't pile on.
+    if check_tables and not issues:
         try:
-            with _TABLES_PATH.open('r', encoding='utf-8') as handle:
-                data = json.load(handle)
-            if not isinstance(data, dict) or not data:
+            data = load_table_map()
+            if not isinstance(data, Mapping) or not data:
                 issues.append('notion_tables.json is empty; run sync_prod_tables.')
         except FileNotFoundError:
             issues.append('notion_tables.json is missing; run sync_prod_tables.')
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             issues.append('notion_tables.json is malformed; re-run sync_prod_tables.')
 
     return issues
@@ -7,6 +7,13 @@ from typing import Optional
 from dotenv import load_dotenv
 
 
+def _mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
 class Config:
     """
     Centralised configuration helper used by the legacy CLI scripts.
@@ -17,6 +24,7 @@ class Config:
     """
 
     _is_loaded: bool = False
+    _env_mtime: Optional[int] = None
 
     # Core secrets / API access
     NOTION_TOKEN: Optional[str] = None
@@ -56,14 +64,18 @@ class Config:
 
         Args:
             env_path: Optional path to a `.env` file. Defaults to project root.
-            force: Reload values even if setup has already run.
-        """
-        if cls._is_loaded and not force:
-            return
+            force: Reload values even if setup has already run and `.env` is unchanged.
 
+        Without `force`, repeat calls only cost a `stat()` of `.env` and reload
+        when its modification time has changed.
+        """
         # Default `.env` lives at the repository root (one level up from this file)
         if env_path is None:
-            env_path = Path(__file__).resolve().parent / ".env"
+            env_path = _DEFAULT_ENV_PATH
+
+        env_mtime = _mtime_ns(env_path)
+        if cls._is_loaded and not force and env_mtime == cls._env_mtime:
+            return
 
         # Load .env if present; fallback to existing environment variables otherwise
         load_dotenv(dotenv_path=env_path, override=True)
@@ -91,8 +103,12 @@ class Config:
         cls.DB_USER = os.getenv("DB_USER")
         cls.DB_PASSWORD = os.getenv("DB_PASSWORD")
 
+        cls._env_mtime = env_mtime
         cls._is_loaded = True
 
 
+_DEFAULT_ENV_PATH = Path(__file__).resolve().parent / ".env"
+
+
 # Allow modules that import Config at import-time to have sensible defaults.
 Config.setup()
@@ -15,4 +15,4 @@ from .wipe_utility import main as wipe_prod_locations # Corrected filename
 from .fetch_medical_facilities import main as fetch_medical_facilities
 from .generate_schema_report import main as generate_schema_report
 from .fetch_medical_facilities import run_backfill as backfill_medical_facilities, run_facility_refresh
-from .generate_lha_forms import run as generate_lha_forms
+from .generate_lha_forms import run as generate_lha_forms, run_batch as generate_lha_forms_batch
@@ -0,0 +1,77 @@
+"""Address and phone normalization shared by the cleanup scripts and Google helpers.
+
+- `normalize_address`: collapse whitespace and drop trailing ", USA" /
+  ", United States" suffixes and stray trailing commas.
+- `normalize_phone`: format 10-digit numbers as "(555) 123-4567", or as
+  "+1 555-123-4567" when `international=True`.
+"""
+
+from __future__ import annotations
+
+import re
+
+# Cheap check for text the suffix/trailing-comma regexes could change.
+_SUFFIX_HINTS = ("usa", "united states", ",")
+_RE_COUNTRY = re.compile(r",\s*(USA|United States)$", re.IGNORECASE)
+_RE_TRAIL_COMMA = re.compile(r",\s*$")
+
+
+class _DigitsOnly(dict):
+    """`str.translate` table that drops everything except decimal digits (same set as regex `\\d`)."""
+
+    def __missing__(self, code: int) -> int | None:
+        keep = code if chr(code).isdecimal() else None
+        self[code] = keep
+        return keep
+
+
+_DIGITS_ONLY = _DigitsOnly()
+
+
+def normalize_address(address: str) -> str:
+    if not address:
+        return address
+    # Collapse internal whitespace (also strips the ends)
+    text = " ".join(address.split())
+    # Most addresses are already clean; only run the regexes when a suffix may need removing
+    if not text.lower().endswith(_SUFFIX_HINTS):
+        return text
+    # Remove trailing country suffixes (case-insensitive)
+    text = _RE_COUNTRY.sub("", text)
+    # Remove any trailing commas introduced by removal
+    text = _RE_TRAIL_COMMA.sub("", text)
+    return text.strip()
+
+
+def normalize_phone(value: str, *, international: bool = False) -> str:
+    if not value:
+        return value
+    text = value.strip()
+    if not text:
+        return text
+
+    digits = text.translate(_DIGITS_ONLY)
+    if not digits:
+        return text
+
+    country_code = None
+    local_digits = digits
+
+    if digits.startswith("1") and len(digits) == 11:
+        country_code = "1"
+        local_digits = digits[1:]
+    elif text.startswith("+") and len(digits) > 10:
+        country_code = digits[:-10]
+        local_digits = digits[-10:]
+
+    if len(local_digits) == 10:
+        if international:
+            # Prefer explicit country code when available, default to +1
+            cc = country_code or "1"
+            return f"+{cc} {local_digits[:3]}-{local_digits[3:6]}-{local_digits[6:]}"
+        return f"({local_digits[:3]}) {local_digits[3:6]}-{local_digits[6:]}"
+
+    if international and country_code and len(local_digits) >= 7:
+        return f"+{country_code} {local_digits}"
+
+    return text
@@ -10,8 +10,9 @@ Run: `python scripts/add_audit_columns.py`
 from __future__ import annotations
 
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Tuple
 
 import sys
 
@@ -22,6 +23,7 @@ from config import Config
 from scripts import notion_utils as nu
 
 NOTION_MAP_FILE = project_root / "notion_tables.json"
+MAX_WORKERS = 6
 AUDIT_COLUMNS = {
     "Created time": {"created_time": {}},
     "Last edited time": {"last_edited_time": {}},
@@ -38,6 +40,35 @@ def _load_production_map() -> Dict[str, str]:
     return data
 
 
+def _process_one(name: str, db_id: str) -> Tuple[bool, List[str]]:
+    """Add missing audit columns to one database; returns (updated, output lines)."""
+    lines = [f"\nChecking '{name}' ({db_id})..."]
+    try:
+        database = nu.get_database(db_id)
+    except Exception as exc:  # noqa: BLE001
+        lines.append(f"  [WARN] Unable to fetch database: {exc}")
+        return False, lines
+
+    current_props = database.get("properties", {})
+    missing = {
+        key: value
+        for key, value in AUDIT_COLUMNS.items()
+        if key not in current_props
+    }
+
+    if not missing:
+        lines.append("  [SKIP] Audit columns already present.")
+        return False, lines
+
+    try:
+        nu.update_database(db_id, {"properties": missing})
+        lines.append(f"  [OK] Added columns: {', '.join(missing.keys())}")
+        return True, lines
+    except Exception as exc:  # noqa: BLE001
+        lines.append(f"  [WARN] Failed to add columns: {exc}")
+        return False, lines
+
+
 def run() -> None:
     Config.setup()
     table_map = _load_production_map()
@@ -48,34 +79,16 @@ def run() -> None:
     added_total = 0
     skipped_total = 0
 
-    for name, db_id in table_map.items():
-        print(f"\nChecking '{name}' ({db_id})...")
-        try:
-            database = nu.get_database(db_id)
-        except Exception as exc:  # noqa: BLE001
-            print(f"  [WARN] Unable to fetch database: {exc}")
-            skipped_total += 1
-            continue
-
-        current_props = database.get("properties", {})
-        missing = {
-            key: value
-            for key, value in AUDIT_COLUMNS.items()
-            if key not in current_props
-        }
-
-        if not missing:
-            print("  [SKIP] Audit columns already present.")
-            skipped_total += 1
-            continue
-
-        try:
-            nu.update_database(db_id, {"properties": missing})
-            print(f"  [OK] Added columns: {', '.join(missing.keys())}")
-            added_total += 1
-        except Exception as exc:  # noqa: BLE001
-            print(f"  [WARN] Failed to add columns: {exc}")
-            skipped_total += 1
+    # Databases are independent, so check/update them concurrently.
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(table_map))) as executor:
+        futures = [executor.submit(_process_one, name, db_id) for name, db_id in table_map.items()]
+        for fut in as_completed(futures):
+            updated, lines = fut.result()
+            print("\n".join(lines))
+            if updated:
+                added_total += 1
+            else:
+                skipped_total += 1
 
     print("\n=== Summary ===")
     print(f"Databases processed: {len(table_map)}")
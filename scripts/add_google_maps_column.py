@@ -10,8 +10,9 @@ Run: `python scripts/add_google_maps_column.py`
 from __future__ import annotations
 
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Tuple
 
 import sys
 
@@ -23,6 +24,8 @@ from scripts import notion_utils as nu
 
 NOTION_MAP_FILE = project_root / "notion_tables.json"
 TARGET_PROPERTY = "Google Maps URL"
+MAX_WORKERS = 6
+_PAYLOAD = {"properties": {TARGET_PROPERTY: {"url": {}}}}
 
 
 def _load_production_map() -> Dict[str, str]:
@@ -35,6 +38,29 @@ def _load_production_map() -> Dict[str, str]:
     return data
 
 
+def _process_one(name: str, db_id: str) -> Tuple[bool, List[str]]:
+    """Add the URL property to one database; returns (added, output lines)."""
+    lines = [f"\nChecking '{name}' ({db_id})..."]
+    try:
+        db = nu.get_database(db_id)
+    except Exception as exc:  # noqa: BLE001
+        lines.append(f"  [WARN] Could not fetch database: {exc}")
+        return False, lines
+
+    properties = db.get("properties", {})
+    if TARGET_PROPERTY in properties:
+        lines.append("  [SKIP] Property already present.")
+        return False, lines
+
+    try:
+        nu.update_database(db_id, _PAYLOAD)
+        lines.append("  [OK] Added 'Google Maps URL' property.")
+        return True, lines
+    except Exception as exc:  # noqa: BLE001
+        lines.append(f"  [WARN] Failed to add property: {exc}")
+        return False, lines
+
+
 def run() -> None:
     Config.setup()
     table_map = _load_production_map()
@@ -45,28 +71,16 @@ def run() -> None:
     added = 0
     skipped = 0
 
-    for name, db_id in table_map.items():
-        print(f"\nChecking '{name}' ({db_id})...")
-        try:
-            db = nu.get_database(db_id)
-        except Exception as exc:  # noqa: BLE001
-            print(f"  [WARN] Could not fetch database: {exc}")
-            skipped += 1
-            continue
-
-        properties = db.get("properties", {})
-        if TARGET_PROPERTY in properties:
-            print("  [SKIP] Property already present.")
-            skipped += 1
-            continue
-
-        try:
-            nu.update_database(db_id, {"properties": {TARGET_PROPERTY: {"url": {}}}})
-            print("  [OK] Added 'Google Maps URL' property.")
-            added += 1
-        except Exception as exc:  # noqa: BLE001
-            print(f"  [WARN] Failed to add property: {exc}")
-            skipped += 1
+    # Databases are independent, so check/update them concurrently.
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(table_map))) as executor:
+        futures = [executor.submit(_process_one, name, db_id) for name, db_id in table_map.items()]
+        for fut in as_completed(futures):
+            did_add, lines = fut.result()
+            print("\n".join(lines))
+            if did_add:
+                added += 1
+            else:
+                skipped += 1
 
     print("\n=== Summary ===")
     print(f"Databases processed: {len(table_map)}")
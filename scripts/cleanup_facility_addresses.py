@@ -9,9 +9,9 @@ Usage: python scripts/cleanup_facility_addresses.py
 
 from __future__ import annotations
 
-import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, Tuple
+import asyncio
+from functools import partial
+from typing import Callable, Dict, Set, Tuple
 
 import sys
 from pathlib import Path
@@ -21,6 +21,7 @@ sys.path.append(str(project_root))
 
 from config import Config
 from scripts import notion_utils as nu
+from scripts._address_norm import normalize_address, normalize_phone
 
 
 ADDRESS_FIELDS: Tuple[str, ...] = (
@@ -33,7 +34,8 @@ PHONE_FIELDS: Tuple[str, ...] = (
     "International Phone",
 )
 
-MAX_WORKERS = 6
+MAX_WORKERS = 6  # concurrent Notion updates
+MAX_PENDING = 64  # queued page tasks before we wait for some to finish
 
 
 def _get_rich_text(props: Dict, key: str) -> str:
@@ -41,79 +43,49 @@ def _get_rich_text(props: Dict, key: str) -> str:
     return arr[0].get("plain_text", "") if arr else ""
 
 
-def _normalize(address: str) -> str:
-    if not address:
-        return address
-    text = address.strip()
-    # Collapse internal whitespace
-    text = re.sub(r"\s+", " ", text)
-    # Remove trailing country suffixes (case-insensitive)
-    text = re.sub(r",\s*(USA|United States)$", "", text, flags=re.IGNORECASE)
-    # Remove any trailing commas introduced by removal
-    text = re.sub(r",\s*$", "", text)
-    return text.strip()
-
-
-def _normalize_phone(value: str, *, international: bool = False) -> str:
-    if not value:
-        return value
-    text = value.strip()
-    if not text:
-        return text
-
-    digits = re.sub(r"\D", "", text)
-    if not digits:
-        return text
-
-    country_code = None
-    local_digits = digits
-
-    if digits.startswith("1") and len(digits) == 11:
-        country_code = "1"
-        local_digits = digits[1:]
-    elif text.startswith("+") and len(digits) > 10:
-        country_code = digits[:-10]
-        local_digits = digits[-10:]
-
-    if len(local_digits) == 10:
-        if international:
-            # Prefer explicit country code when available, default to +1
-            cc = country_code or "1"
-            return f"+{cc} {local_digits[:3]}-{local_digits[3:6]}-{local_digits[6:]}"
-        return f"({local_digits[:3]}) {local_digits[3:6]}-{local_digits[6:]}"
+# (field, normalizer) pairs checked on every page, in update order.
+_FIELD_NORMALIZERS: Tuple[Tuple[str, Callable[[str], str]], ...] = (
+    *((field, normalize_address) for field in ADDRESS_FIELDS),
+    *(
+        (field, partial(normalize_phone, international=(field == "International Phone")))
+        for field in PHONE_FIELDS
+    ),
+)
 
-    if international and country_code and len(local_digits) >= 7:
-        return f"+{country_code} {local_digits}"
 
-    return text
+_FIELD_NAMES = frozenset(field for field, _ in _FIELD_NORMALIZERS)
 
 
-def _process_page(page: Dict) -> tuple[bool, str | None]:
-    page_id = page.get("id")
-    props = page.get("properties", {})
-    updates: Dict[str, Dict] = {}
-
-    for field in ADDRESS_FIELDS:
-        value = _get_rich_text(props, field)
-        if not value:
+def _page_updates(props: Dict) -> Dict[str, Dict] | None:
+    """Returns the property payload for fields that need cleaning, or None if the page is clean."""
+    if _FIELD_NAMES.isdisjoint(props):
+        return None
+    updates: Dict[str, Dict] | None = None
+    for field, normalize in _FIELD_NORMALIZERS:
+        prop = props.get(field)
+        if not prop:
             continue
-        cleaned = _normalize(value)
-        if cleaned != value:
-            updates[field] = nu.format_rich_text(cleaned)
-
-    for field in PHONE_FIELDS:
-        value = _get_rich_text(props, field)
+        arr = prop.get("rich_text")
+        if not arr:
+            continue
+        value = arr[0].get("plain_text", "")
         if not value:
             continue
-        cleaned = _normalize_phone(value, international=(field == "International Phone"))
+        cleaned = normalize(value)
         if cleaned != value:
+            if updates is None:
+                updates = {}
             updates[field] = nu.format_rich_text(cleaned)
+    return updates
+
 
-    if not updates:
-        return False, None
+async def _process_page(client, sem: asyncio.Semaphore, page: Dict, updates: Dict[str, Dict]) -> tuple[bool, str | None]:
+    page_id = page.get("id")
+    props = page.get("properties", {})
 
     try:
-        nu.update_page(page_id, updates)
+        async with sem:
+            await nu.update_page_async(client, page_id, updates)
         name = _get_rich_text(props, "Location Name") or _get_rich_text(props, "Name")
         fields = ", ".join(updates.keys())
         return True, f"[UPDATED] {name or page_id}: {fields}"
@@ -121,6 +93,42 @@ def _process_page(page: Dict) -> tuple[bool, str | None]:
         return False, f"[WARN] Failed to update page {page_id}: {exc}"
 
 
+async def _update_pages(db_id: str) -> Tuple[int, int]:
+    updated_count = 0
+    skipped_count = 0
+
+    def _record(done) -> None:
+        nonlocal updated_count, skipped_count
+        for task in done:
+            updated, message = task.result()
+            if updated:
+                updated_count += 1
+            else:
+                skipped_count += 1
+            if message:
+                print(message)
+
+    # Single pooled connection; the semaphore keeps us within Notion's rate limits.
+    sem = asyncio.Semaphore(MAX_WORKERS)
+    pending: Set[asyncio.Task] = set()
+    async with nu.async_client() as client:
+        # Updates start while later result pages are still being fetched.
+        async for page in nu.iter_query_database_async(client, db_id):
+            # Clean pages (the common case on reruns) never get a task.
+            updates = _page_updates(page.get("properties", {}))
+            if updates is None:
+                skipped_count += 1
+                continue
+            pending.add(asyncio.ensure_future(_process_page(client, sem, page, updates)))
+            if len(pending) >= MAX_PENDING:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                _record(done)
+        if pending:
+            done, _ = await asyncio.wait(pending)
+            _record(done)
+    return updated_count, skipped_count
+
+
 def run() -> None:
     Config.setup()
     db_id = Config.MEDICAL_FACILITIES_DB
@@ -129,25 +137,11 @@ def run() -> None:
         return
 
     print("Fetching Medical Facilities pages...")
-    pages = nu.query_database(db_id)
-    if not pages:
+    updated_count, skipped_count = asyncio.run(_update_pages(db_id))
+    if not updated_count and not skipped_count:
         print("No facilities found. Nothing to do.")
         return
 
-    updated_count = 0
-    skipped_count = 0
-
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        futures = [executor.submit(_process_page, page) for page in pages]
-        for fut in as_completed(futures):
-            updated, message = fut.result()
-            if updated:
-                updated_count += 1
-            else:
-                skipped_count += 1
-            if message:
-                print(message)
-
     print("\n--- Summary ---")
     print(f"Updated pages: {updated_count}")
     print(f"Unchanged pages: {skipped_count}")
@@ -9,11 +9,10 @@ Run: `python scripts/cleanup_production_addresses.py`
 
 from __future__ import annotations
 
+import asyncio
 import json
-import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Set, Tuple
 
 import sys
 
@@ -22,41 +21,36 @@ sys.path.append(str(project_root))
 
 from config import Config
 from scripts import notion_utils as nu
+from scripts._address_norm import normalize_address
 
 
 FULL_ADDRESS_FIELD = "Full Address"
-MAX_WORKERS = 6
+MAX_WORKERS = 6  # concurrent Notion updates
+MAX_PENDING = 64  # queued page tasks before we wait for some to finish
 NOTION_MAP_FILE = project_root / "notion_tables.json"
 
 
-def _normalize(address: str) -> str:
-    text = address.strip()
-    if not text:
-        return text
-    text = re.sub(r"\s+", " ", text)
-    text = re.sub(r",\s*(USA|United States)$", "", text, flags=re.IGNORECASE)
-    text = re.sub(r",\s*$", "", text)
-    return text.strip()
-
-
 def _get_full_address(props: Dict) -> str:
     arr = props.get(FULL_ADDRESS_FIELD, {}).get("rich_text", [])
     return arr[0].get("plain_text", "") if arr else ""
 
 
-def _process_page(page: Dict) -> tuple[bool, str | None]:
-    page_id = page.get("id")
-    props = page.get("properties", {})
+def _cleaned_address(props: Dict) -> str | None:
+    """Returns the normalized Full Address, or None if it is empty or already clean."""
     current = _get_full_address(props)
     if not current:
-        return False, None
+        return None
+    cleaned = normalize_address(current)
+    return None if cleaned == current else cleaned
 
-    cleaned = _normalize(current)
-    if cleaned == current:
-        return False, None
+
+async def _process_page(client, sem: asyncio.Semaphore, page: Dict, cleaned: str) -> tuple[bool, str | None]:
+    page_id = page.get("id")
+    props = page.get("properties", {})
 
     try:
-        nu.update_page(page_id, {FULL_ADDRESS_FIELD: nu.format_rich_text(cleaned)})
+        async with sem:
+            await nu.update_page_async(client, page_id, {FULL_ADDRESS_FIELD: nu.format_rich_text(cleaned)})
         name = props.get("Practical Name", {}).get("rich_text", [])
         practical = name[0].get("plain_text", "") if name else ""
         label = practical or _get_full_address(props) or page_id
@@ -65,6 +59,41 @@ def _process_page(page: Dict) -> tuple[bool, str | None]:
         return False, f"[WARN] Failed to update page {page_id}: {exc}"
 
 
+async def _update_pages(db_id: str) -> Tuple[int, int]:
+    """Returns (pages updated, pages scanned)."""
+    updated = 0
+    scanned = 0
+
+    def _record(done) -> None:
+        nonlocal updated
+        for task in done:
+            did_update, message = task.result()
+            if message:
+                print(f"  {message}")
+            if did_update:
+                updated += 1
+
+    # Single pooled connection; the semaphore keeps us within Notion's rate limits.
+    sem = asyncio.Semaphore(MAX_WORKERS)
+    pending: Set[asyncio.Task] = set()
+    async with nu.async_client() as client:
+        # Updates start while later result pages are still being fetched.
+        async for page in nu.iter_query_database_async(client, db_id):
+            scanned += 1
+            # Clean pages (the common case on reruns) never get a task.
+            cleaned = _cleaned_address(page.get("properties", {}))
+            if cleaned is None:
+                continue
+            pending.add(asyncio.ensure_future(_process_page(client, sem, page, cleaned)))
+            if len(pending) >= MAX_PENDING:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                _record(done)
+        if pending:
+            done, _ = await asyncio.wait(pending)
+            _record(done)
+    return updated, scanned
+
+
 def _load_production_map() -> Dict[str, str]:
     if not NOTION_MAP_FILE.is_file():
         raise FileNotFoundError("notion_tables.json not found. Run sync first.")
@@ -87,24 +116,14 @@ def run() -> None:
 
     for prod_name, db_id in table_map.items():
         print(f"\nProcessing production '{prod_name}' ({db_id})...")
-        pages = nu.query_database(db_id)
-        if not pages:
+        updated, scanned = asyncio.run(_update_pages(db_id))
+        if not scanned:
             print("  - No pages found.")
             continue
 
-        updated = 0
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            futures = [executor.submit(_process_page, page) for page in pages]
-            for fut in as_completed(futures):
-                did_update, message = fut.result()
-                if message:
-                    print(f"  {message}")
-                if did_update:
-                    updated += 1
-
-        total_pages += len(pages)
+        total_pages += scanned
         total_updated += updated
-        print(f"  Summary for {prod_name}: {updated} updated / {len(pages)} total")
+        print(f"  Summary for {prod_name}: {updated} updated / {scanned} total")
 
     print("\n=== Overall Summary ===")
     print(f"Databases processed: {len(table_map)}")
@@ -1,7 +1,11 @@
 import logging
+import re
 import sys
+from functools import lru_cache
 from pathlib import Path
-from notion_client.errors import APIResponseError
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import requests
 
 # Add project root ('c:\\Utils\\LocationsSync') to path to allow for clean imports
 project_root = Path(__file__).resolve().parents[1]
@@ -13,6 +17,15 @@ from scripts import notion_utils as nu
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+_REQUIRED_VARS = (
+    'NOTION_TOKEN', 'PRODUCTIONS_MASTER_DB',
+    'LOCATIONS_MASTER_DB', 'NOTION_DATABASES_PARENT_PAGE_ID',
+    'PROD_MASTER_TITLE_PROP'
+)
+
+# ProductionID titles: "PM" followed by the sequence number.
+_PROD_ID_RE = re.compile(r"PM(\d+)")
+
 def _build_status_property_definition() -> dict:
     """
     Returns the canonical Status property definition.
@@ -28,12 +41,18 @@ def get_locations_db_schema(locations_master_db_id: str) -> dict:
     """
     Returns the standard schema for a new production locations database.
     This ensures consistency across all created databases.
+
+    The result is cached and shared between calls; treat it as read-only.
     """
+    return _locations_db_schema(Config.PRODUCTIONS_MASTER_DB, locations_master_db_id)
+
+@lru_cache(maxsize=8)
+def _locations_db_schema(productions_master_db_id: str, locations_master_db_id: str) -> dict:
     return {
         # --- Relations & Identifiers ---
         "ProductionID": {
             "relation": {
-                "database_id": Config.PRODUCTIONS_MASTER_DB,
+                "database_id": productions_master_db_id,
                 "single_property": {}
             }
         },
@@ -69,22 +88,56 @@ def get_locations_db_schema(locations_master_db_id: str) -> dict:
         "Last edited time": {"last_edited_time": {}}
     }
 
-def configure_status_property(database_id: str) -> None:
+def configure_status_property(database_id: str, db_obj: Optional[dict] = None, extra_payload: Optional[dict] = None) -> Optional[dict]:
     """
     Ensures the target database has a Status property with the expected options.
     Groups are configured so that new rows default to the Ready state.
+
+    Pass `db_obj` when the caller already holds the database object (e.g. from
+    create/update) to skip the initial fetch. `extra_payload` holds other
+    database fields (e.g. description) to send with the first Status update, or
+    on their own if no Status update is made. Returns the latest database object
+    seen, or None if it could not be inspected.
     """
+    pending = dict(extra_payload or {})
+
+    def update(payload: dict) -> dict:
+        result = nu.update_database(database_id, {**pending, **payload})
+        pending.clear()
+        return result
+
+    db_obj = _configure_status(database_id, db_obj, update)
+    if pending:
+        try:
+            db_obj = nu.update_database(database_id, pending)
+        except Exception as exc:  # noqa: BLE001
+            logging.warning("Unable to update database %s: %s", database_id, exc)
+    return db_obj
+
+def _status_option_state(status_prop: dict) -> Tuple[Dict[str, str], List[str]]:
+    """
+    Returns the Status property's option name -> id map and the required
+    option names it is missing. Notion returns options as objects with
+    name/id; a malformed payload raises KeyError for the caller to handle.
+    """
+    option_map = {opt["name"]: opt["id"] for opt in status_prop.get("status", {}).get("options", ())}
+    required = (Config.STATUS_ON_RESET, Config.STATUS_AFTER_MATCHING, Config.STATUS_ERROR)
+    return option_map, [name for name in required if name not in option_map]
+
+def _configure_status(database_id: str, db_obj: Optional[dict], update: Callable[[dict], dict]) -> Optional[dict]:
+    ready, matched, error = Config.STATUS_ON_RESET, Config.STATUS_AFTER_MATCHING, Config.STATUS_ERROR
     desired_options = [
-        {"name": Config.STATUS_ON_RESET, "color": "default"},
-        {"name": Config.STATUS_AFTER_MATCHING, "color": "green"},
-        {"name": Config.STATUS_ERROR, "color": "red"}
+        {"name": ready, "color": "default"},
+        {"name": matched, "color": "green"},
+        {"name": error, "color": "red"}
     ]
 
-    try:
-        db_obj = nu.get_database(database_id)
-    except Exception as exc:  # noqa: BLE001
-        logging.warning("Unable to inspect database %s before configuring Status: %s", database_id, exc)
-        return
+    if db_obj is None:
+        try:
+            db_obj = nu.get_database(database_id)
+        except Exception as exc:  # noqa: BLE001
+            logging.warning("Unable to inspect database %s before configuring Status: %s", database_id, exc)
+            return None
 
     properties = db_obj.get("properties", {})
     status_prop = properties.get("Status")
@@ -94,14 +147,12 @@ def configure_status_property(database_id: str) -> None:
             database_id,
             status_prop.get("type")
         )
-        return
+        return db_obj
 
     if status_prop is None:
         try:
-            nu.update_database(
-                database_id,
-                {"properties": {"Status": {"status": {"options": desired_options}}}}
-            )
+            # Notion returns the full updated database object.
+            db_obj = update({"properties": {"Status": {"status": {"options": desired_options}}}})
             logging.info("Created missing Status property on database %s", database_id)
         except Exception as exc:  # noqa: BLE001
             logging.warning(
@@ -110,22 +161,17 @@ def configure_status_property(database_id: str) -> None:
                 exc
             )
             print("[REMINDER] Add a 'Status' property (type: Status) in Notion.")
-            return
+            return db_obj
 
     try:
-        db_obj = nu.get_database(database_id)
         status_prop = db_obj.get("properties", {}).get("Status", {})
         if not status_prop or status_prop.get("type") != "status":
             print("[REMINDER] Add a 'Status' property (type: Status) in Notion.")
-            return
-        option_map = {
-            opt.get("name"): opt.get("id")
-            for opt in status_prop.get("status", {}).get("options", [])
-            if isinstance(opt, dict)
-        }
-        ready_id = option_map.get(Config.STATUS_ON_RESET)
-        matched_id = option_map.get(Config.STATUS_AFTER_MATCHING)
-        error_id = option_map.get(Config.STATUS_ERROR)
+            return db_obj
+        option_map, _ = _status_option_state(status_prop)
+        ready_id = option_map.get(ready)
+        matched_id = option_map.get(matched)
+        error_id = option_map.get(error)
 
         groups_payload = []
         if ready_id:
@@ -136,23 +182,21 @@ def configure_status_property(database_id: str) -> None:
             groups_payload.append({"name": "Needs Attention", "color": "red", "option_ids": [error_id]})
 
         if groups_payload:
-            nu.update_database(
-                database_id,
-                {"properties": {"Status": {"status": {"groups": groups_payload}}}}
-            )
+            db_obj = update({"properties": {"Status": {"status": {"groups": groups_payload}}}})
     except Exception as exc:  # noqa: BLE001
         logging.warning("Unable to configure Status groups on database %s: %s", database_id, exc)
+    return db_obj
 
-def validate_config(required_vars: list[str]) -> bool:
+def validate_config(required_vars: Sequence[str]) -> bool:
     """Checks if all required variables are present in the Config."""
+    if all(getattr(Config, var, None) for var in required_vars):
+        return True
     missing_vars = [var for var in required_vars if not getattr(Config, var, None)]
-    if missing_vars:
-        logging.error("Missing one or more required environment variables.")
-        print("\n[ERROR] Missing one or more required environment variables in your .env file:")
-        for var in missing_vars:
-            print(f"  - {var}")
-        return False
-    return True
+    logging.error("Missing one or more required environment variables.")
+    print("\n[ERROR] Missing one or more required environment variables in your .env file:")
+    for var in missing_vars:
+        print(f"  - {var}")
+    return False
 
 def create_locations_database(production_name: str, abbreviation: str, parent_page_id: str, locations_master_db_id: str) -> dict:
     """
@@ -173,38 +217,36 @@ def create_locations_database(production_name: str, abbreviation: str, parent_pa
     logging.info(f"Successfully created new database '{db_title}' with ID: {new_db_id}")
     print(f"[INFO] Successfully created new locations database '{db_title}'.")
 
+    # The description needs the new ID, so it rides along with the Status
+    # setup's update. Create/update both return the full database object, so
+    # the Status setup and verification below need no extra fetches.
     description_text = f"Production: {production_name}\nDatabase ID: {new_db_id}"
-    try:
-        nu.update_database(
-            new_db_id,
-            {"description": [{"type": "text", "text": {"content": description_text}}]}
-        )
-    except Exception as exc:  # noqa: BLE001
-        logging.warning("Unable to set description for database %s: %s", new_db_id, exc)
-
-    # Ensure the Status property exists with the expected options and default grouping.
-    configure_status_property(new_db_id)
+    db_obj = configure_status_property(
+        new_db_id,
+        new_db_response,
+        extra_payload={"description": [{"type": "text", "text": {"content": description_text}}]},
+    )
 
     # --- Post-create: verify Status options and remind if Notion rejected them ---
     try:
-        db_obj = nu.get_database(new_db_id)
+        if db_obj is None:
+            raise ValueError("Database object unavailable")
         properties = db_obj.get("properties", {})
         status_prop = properties.get("Status")
 
         if status_prop is None:
-            print("[REMINDER] Add a 'Status' property (type: Status) in Notion.")
-            print("  After adding the property, create these options:"
+            print("[REMINDER] Add a 'Status' property (type: Status) in Notion.\n"
+                  "  After adding the property, create these options:"
                   f" {Config.STATUS_ON_RESET}, {Config.STATUS_AFTER_MATCHING}, {Config.STATUS_ERROR}.")
             raise ValueError("Status property missing")
 
-        existing = [opt.get("name") for opt in status_prop.get("status", {}).get("options", []) if isinstance(opt, dict)]
-        required = [Config.STATUS_ON_RESET, Config.STATUS_AFTER_MATCHING, Config.STATUS_ERROR]
-        missing = [name for name in required if name not in (existing or [])]
+        _, missing = _status_option_state(status_prop)
         if missing:
-            print("[REMINDER] Add these Status options in Notion:")
-            for name in missing:
-                print(f"   - {name}")
-            print("  Open the database in Notion, edit the 'Status' property, and add the missing options.")
+            print("\n".join([
+                "[REMINDER] Add these Status options in Notion:",
+                *(f"   - {name}" for name in missing),
+                "  Open the database in Notion, edit the 'Status' property, and add the missing options.",
+            ]))
         else:
             print("[INFO] 'Status' property already has the required options.")
     except Exception:
@@ -214,38 +256,55 @@ def create_locations_database(production_name: str, abbreviation: str, parent_pa
     print(f"   URL: {new_db_response['url']}")
     return new_db_response
 
-def handle_api_error(e: APIResponseError) -> None:
+_API_ERROR_HELP = (
+    "  - Please check that your API token has the correct permissions.\n"
+    "  - Ensure the parent page and master database IDs in your .env file are correct and shared with the integration.\n"
+    "  - Make sure a property named '{link_prop}' of type 'URL' exists in your Productions Master DB."
+)
+
+_FINAL_INSTRUCTIONS = (
+    "\n--- Automation Complete! ---\n"
+    "Next Step: You must now sync the application with your Notion changes.\n"
+    "Please run '[2] Sync Production Tables from Notion' from the main menu."
+)
+
+def handle_api_error(e: requests.exceptions.RequestException) -> None:
     """Logs and prints a user-friendly error message for Notion API errors."""
     logging.error(f"Notion API Error during production creation: {e}", exc_info=True)
-    print(f"\n[ERROR] A Notion API error occurred: {e}")
-    print("  - Please check that your API token has the correct permissions.")
-    print("  - Ensure the parent page and master database IDs in your .env file are correct and shared with the integration.")
-    print(f"  - Make sure a property named '{Config.PROD_MASTER_LINK_PROP}' of type 'URL' exists in your Productions Master DB.")
+    print(f"\n[ERROR] A Notion API error occurred: {e}\n{_API_ERROR_HELP.format(link_prop=Config.PROD_MASTER_LINK_PROP)}")
 
 def print_final_instructions() -> None:
     """Prints the final instructions for the user after successful creation."""
-    print("\n--- Automation Complete! ---")
-    print("Next Step: You must now sync the application with your Notion changes.")
-    print("Please run '[2] Sync Production Tables from Notion' from the main menu.")
+    print(_FINAL_INSTRUCTIONS)
+
+def _title_text(page: dict, title_prop: str) -> str:
+    title_list = page.get("properties", {}).get(title_prop, {}).get("title", [])
+    return title_list[0].get("plain_text", "") if title_list else ""
 
 def generate_next_production_id(db_id: str, title_prop: str) -> str:
     """Generates the next sequential ProductionID based on existing entries."""
     print("\n[INFO] Determining next ProductionID...")
-    all_pages = nu.query_database(db_id)
-    
-    max_id = 0
-    for page in all_pages:
-        try:
-            title_list = page.get("properties", {}).get(title_prop, {}).get("title", [])
-            if title_list:
-                prod_id_str = title_list[0].get("plain_text", "")
-                if prod_id_str.startswith("PM") and prod_id_str[2:].isdigit():
-                    current_id = int(prod_id_str[2:])
-                    if current_id > max_id:
-                        max_id = current_id
-        except (ValueError, TypeError):
-            continue # Ignore pages with malformed ProductionIDs
-            
+    # Ask Notion for the highest 'PM...' title. Title sorting is lexical, which
+    # matches numeric order only while every ID is 'PM' + 3 digits; anything
+    # else (or PM999, after which IDs grow a digit) falls back to a full scan.
+    top_page = next(nu.iter_query_database(
+        db_id,
+        {"property": title_prop, "title": {"starts_with": "PM"}},
+        sorts=[{"property": title_prop, "direction": "descending"}],
+        page_size=1,
+    ), None)
+    top_title = _title_text(top_page, title_prop) if top_page else ""
+
+    top_match = _PROD_ID_RE.fullmatch(top_title)
+    if not top_page:
+        max_id = 0
+    elif top_match and len(top_match.group(1)) == 3 and top_title != "PM999":
+        max_id = int(top_match.group(1))
+    else:
+        # Pages with malformed ProductionIDs are ignored.
+        matches = (_PROD_ID_RE.fullmatch(_title_text(page, title_prop)) for page in nu.iter_query_database(db_id))
+        max_id = max((int(m.group(1)) for m in matches if m), default=0)
+
     next_id = max_id + 1
     new_prod_id = f"PM{next_id:03d}"
     print(f"  - Next ProductionID will be: {new_prod_id}")
@@ -276,12 +335,7 @@ def main() -> None:
     print("--- Create New Production Utility ---")
     
     # 1. Validate configuration from config.py
-    required_vars = [
-        'NOTION_TOKEN', 'PRODUCTIONS_MASTER_DB', 
-        'LOCATIONS_MASTER_DB', 'NOTION_DATABASES_PARENT_PAGE_ID',
-        'PROD_MASTER_TITLE_PROP'
-    ]
-    if not validate_config(required_vars):
+    if not validate_config(_REQUIRED_VARS):
         return
 
     production_name = input("Enter the name for the new production (e.g., 'Project Phoenix'): ").strip()
@@ -296,7 +350,8 @@ def main() -> None:
         print("[WARN] Abbreviation cannot be empty.")
 
     try:
-        # Generate the next ProductionID before creating any databases
+        # Generate the next ProductionID before creating any databases, so a
+        # failed lookup leaves nothing half-created in Notion
         next_prod_id = generate_next_production_id(
             Config.PRODUCTIONS_MASTER_DB,
             Config.PROD_MASTER_TITLE_PROP
@@ -323,25 +378,25 @@ def main() -> None:
 
         print_final_instructions()
 
-    except APIResponseError as e:
+    except requests.exceptions.RequestException as e:
+        # notion_utils has already retried rate limits and transient failures.
         handle_api_error(e)
 
 if __name__ == "__main__":
     # This block is for standalone execution, which is not the primary use case
     # but it's good practice to ensure it works.
     # The main application entry point (run.py) handles this setup.
-    from dotenv import load_dotenv
-    # Add project root ('c:\\Utils\\LocationsSync') to path to allow for clean imports
-    project_root = Path(__file__).resolve().parents[1]
-    sys.path.append(str(project_root))
+    # project_root is already on sys.path (see the top of this module).
 
     # Load environment variables for all scripts that will be called
     dotenv_path = project_root / '.env'
-    if dotenv_path.exists():
+    if dotenv_path.is_file():
+        from dotenv import load_dotenv
         load_dotenv(dotenv_path=dotenv_path)
     else:
         print("Warning: .env file not found. Script may fail if config is not set in environment.")
 
-    # Import and set up the central config after loading the .env file
+    # Set up the central config after loading the .env file (a no-op if the
+    # import-time setup already saw this .env).
     Config.setup()
     main()
@@ -14,24 +14,28 @@ Steps:
 Note:
 - Uses Config.setup() to load env vars
 - Uses scripts/notion_utils.py for Notion HTTP calls
-- Keeps all logic within this file and exposes a single run() function
+- Keeps all logic within this file and exposes run(), plus run_batch() to
+  generate several locations of one production without prompting
 """
 
 from __future__ import annotations
 
 import csv
-import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
 
 # Third-party
-try:
-    from docxtpl import DocxTemplate, RichText
-except Exception as _e:  # noqa: BLE001
-    DocxTemplate = None  # Defer import error until runtime for clear UX
+import orjson
+
+# docxtpl pulls in lxml, python-docx and jinja2, which is slow; _check_renderer()
+# imports it on first use so importing the `scripts` package stays fast
+DocxTemplate = RichText = None
 
 # Local imports
 import sys
@@ -44,6 +48,9 @@ from scripts import notion_utils as nu
 # ---------- Helpers: Property readers ----------
 
 PATH_CACHE_FILE = project_root / "lha_paths.json"
+TEMPLATE_PATH = project_root / "templates" / "LHA_Template.docx"
+MAX_FETCH_WORKERS = 4  # concurrent Notion page fetches
+MAX_RENDER_WORKERS = 8  # concurrent document renders in run_batch()
 
 
 def _get_rich_text(props: Dict[str, Any], key: str) -> str:
@@ -70,10 +77,40 @@ def _get_relation_ids(props: Dict[str, Any], key: str) -> List[str]:
     return [x.get("id") for x in arr if isinstance(x, dict) and x.get("id")]
 
 
+def _first_plain_text(arr: Optional[list]) -> str:
+    return arr[0].get("plain_text", "") if arr else ""
+
+
+# Value readers keyed by Notion property type, for `_extract_props`
+_EXTRACTORS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "rich_text": lambda meta: _first_plain_text(meta.get("rich_text")),
+    "title": lambda meta: _first_plain_text(meta.get("title")),
+    "url": lambda meta: meta.get("url") or "",
+    "phone_number": lambda meta: meta.get("phone_number") or "",
+}
+
+
+def _extract_props(props: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Read every supported property in one pass, grouped as {type: {name: value}}."""
+    values: Dict[str, Dict[str, Any]] = {kind: {} for kind in _EXTRACTORS}
+    for key, meta in props.items():
+        kind = meta.get("type") if isinstance(meta, dict) else None
+        extractor = _EXTRACTORS.get(kind)
+        if extractor is not None:
+            values[kind][key] = extractor(meta)
+    return values
+
+
+_RE_FS_INVALID = re.compile(r"[\\/:*?\"<>|]+")
+_RE_UNDERSCORES = re.compile(r"_+")
+_RE_WHITESPACE = re.compile(r"\s+")
+_RE_COMMA = re.compile(r",\s*")
+
+
 def _sanitize_filename(name: str) -> str:
     # Replace characters invalid on Windows/macOS/Linux filesystems
-    name = re.sub(r"[\\/:*?\"<>|]+", "_", name).strip()
-    name = re.sub(r"_+", "_", name)
+    name = _RE_FS_INVALID.sub("_", name).strip()
+    name = _RE_UNDERSCORES.sub("_", name)
     name = name.strip("._")
     if len(name) > 80:
         name = name[:80].rstrip("._")
@@ -84,81 +121,74 @@ def _normalize_address(value: str | None) -> str:
     if not value:
         return ""
     text = value.replace("\r", "").replace("\n", ", ")
-    text = re.sub(r"\s+", " ", text)
-    text = re.sub(r",\s*", ", ", text)
+    text = _RE_WHITESPACE.sub(" ", text)
+    text = _RE_COMMA.sub(", ", text)
     text = text.replace(", ,", ", ")
     return text.strip().strip(",")
 
 
-def _compose_hours_str(props: Dict[str, Any]) -> str:
-    # Facilities store weekday-specific hours as rich_text fields
-    day_to_prop = {
-        "Monday": "Monday Hours",
-        "Tuesday": "Tuesday Hours",
-        "Wednesday": "Wednesday Hours",
-        "Thursday": "Thursday Hours",
-        "Friday": "Friday Hours",
-        "Saturday": "Saturday Hours",
-        "Sunday": "Sunday Hours",
-    }
-    ordered_days = list(day_to_prop.keys())
-    normalized: List[Tuple[str, str]] = []
-    for day in ordered_days:
-        value = _get_rich_text(props, day_to_prop[day]).strip()
-        normalized.append((day, value or "Closed"))
-
-    grouped: List[Dict[str, str]] = []  # each entry: {'start': day, 'end': day, 'hours': value}
-    for day, hours in normalized:
-        if not grouped or grouped[-1]["hours"] != hours:
-            grouped.append({"start": day, "end": day, "hours": hours})
-        else:
-            grouped[-1]["end"] = day
-
-    def label(start: str, end: str) -> str:
-        return start if start == end else f"{start}-{end}"
-
-    return "\n".join(
-        f"{label(entry['start'], entry['end'])}: {entry['hours']}"
-        for entry in grouped
-    )
+# Facilities store weekday-specific hours as rich_text fields
+_DAY_TO_PROP = (
+    ("Monday", "Monday Hours"),
+    ("Tuesday", "Tuesday Hours"),
+    ("Wednesday", "Wednesday Hours"),
+    ("Thursday", "Thursday Hours"),
+    ("Friday", "Friday Hours"),
+    ("Saturday", "Saturday Hours"),
+    ("Sunday", "Sunday Hours"),
+)
+
+
+def _compose_hours_str(rich: Dict[str, str]) -> str:
+    # `rich` maps property name -> text; consecutive days with the same hours collapse to one line
+    pairs = [(day, rich.get(prop, "").strip() or "Closed") for day, prop in _DAY_TO_PROP]
+    lines: List[str] = []
+    for hours, run in groupby(pairs, key=itemgetter(1)):
+        days = [day for day, _ in run]
+        label = days[0] if len(days) == 1 else f"{days[0]}-{days[-1]}"
+        lines.append(f"{label}: {hours}")
+    return "\n".join(lines)
 
 
 def _read_facility(page: dict) -> Dict[str, str]:
-    props = page.get("properties", {})
+    values = _extract_props(page.get("properties", {}))
+    rich, titles, urls, phones = (
+        values["rich_text"], values["title"], values["url"], values["phone_number"]
+    )
     # Prefer explicit 'Location Name' if present, else try the title
     name = (
-        _get_rich_text(props, "Name")
-        or _get_rich_text(props, "Facility Name")
-        or _get_rich_text(props, "Location Name")
-        or _get_title(props, "Name")
-        or _get_title(props, "Facility Name")
-        or _get_title(props, "MedicalFacilityID")
-        or _get_title(props, "Title")
+        rich.get("Name")
+        or rich.get("Facility Name")
+        or rich.get("Location Name")
+        or titles.get("Name")
+        or titles.get("Facility Name")
+        or titles.get("MedicalFacilityID")
+        or titles.get("Title")
     )
 
     address = (
-        _get_rich_text(props, "Address")
-        or _get_rich_text(props, "Full Address")
-        or _get_rich_text(props, "Location Address")
+        rich.get("Address")
+        or rich.get("Full Address")
+        or rich.get("Location Address")
     )
     address = _normalize_address(address)
 
     phone = (
-        props.get("Phone", {}).get("phone_number")
-        or props.get("International Phone", {}).get("phone_number")
-        or _get_rich_text(props, "Phone")
-        or _get_rich_text(props, "International Phone")
+        phones.get("Phone")
+        or phones.get("International Phone")
+        or rich.get("Phone")
+        or rich.get("International Phone")
         or ""
     ).strip()
 
     website = (
-        _get_url(props, "Website")
-        or _get_url(props, "Site")
-        or _get_url(props, "URL")
+        urls.get("Website")
+        or urls.get("Site")
+        or urls.get("URL")
     )
-    maps_url = _get_url(props, "Google Maps URL")
+    maps_url = urls.get("Google Maps URL")
 
-    hours = _compose_hours_str(props)
+    hours = _compose_hours_str(rich)
     return {
         "name": name or "",
         "address": address or "",
@@ -171,14 +201,35 @@ def _read_facility(page: dict) -> Dict[str, str]:
 
 # ---------- Core flow ----------
 
+def _derive_production_labels(table_key: str) -> Tuple[str, str]:
+    """(name, abbrev) guessed from a notion_tables.json key (e.g., 'AMCL_Locations')."""
+    if table_key.endswith("_Locations"):
+        abbrev = table_key.replace("_Locations", "")
+        return abbrev, abbrev
+    return table_key, table_key
+
+
+TABLES_FILE = project_root / "notion_tables.json"
+# Parsed JSON files keyed by path -> (st_mtime_ns, data); reused across run() calls until the file changes
+_JSON_CACHE: Dict[Path, Tuple[int, Any]] = {}
+
+
+def _cached_json(path: Path, encoding: str = "utf-8") -> Any:
+    mtime_ns = path.stat().st_mtime_ns
+    cached = _JSON_CACHE.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    data = orjson.loads(path.read_text(encoding=encoding))
+    _JSON_CACHE[path] = (mtime_ns, data)
+    return data
+
+
 def _load_productions_map() -> Dict[str, str]:
-    path = project_root / "notion_tables.json"
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if not isinstance(data, dict):
-                raise ValueError("Invalid format in notion_tables.json")
-            return data
+        data = _cached_json(TABLES_FILE)
+        if not isinstance(data, dict):
+            raise ValueError("Invalid format in notion_tables.json")
+        return dict(data)
     except Exception as e:  # noqa: BLE001
         print("\n[ERROR] Could not read notion_tables.json. Run sync first.")
         print(f"Reason: {e}")
@@ -264,6 +315,37 @@ def _get_location_context(page: dict) -> Tuple[Dict[str, Any], Optional[str], Op
     return base, master_id, production_page_id
 
 
+def _prefetch_pages(page_ids: List[Optional[str]], page_cache: Dict[str, Dict]) -> Dict[str, Exception]:
+    """
+    Fetch the pages not yet in `page_cache` concurrently and store them there.
+    Returns the fetch error for each page that could not be retrieved.
+    """
+    missing = [pid for pid in dict.fromkeys(page_ids) if pid and pid not in page_cache]
+    errors: Dict[str, Exception] = {}
+    if not missing:
+        return errors
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(missing))) as executor:
+        futures = {executor.submit(nu.get_page, pid): pid for pid in missing}
+        for future in as_completed(futures):
+            pid = futures[future]
+            try:
+                page_cache[pid] = future.result()
+            except Exception as e:  # noqa: BLE001
+                errors[pid] = e
+    return errors
+
+
+def _facility_ids(master_page: dict) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """First UC1, UC2 (optional) and ER facility relation ids on a master page."""
+    mprops = master_page.get("properties", {})
+
+    def get_first(rel_name: str) -> Optional[str]:
+        ids = _get_relation_ids(mprops, rel_name)
+        return ids[0] if ids else None
+
+    return get_first("UC1"), get_first("UC2"), get_first("ER")
+
+
 def _augment_with_master_data(
     ctx: Dict[str, Any],
     master_id: Optional[str],
@@ -272,15 +354,11 @@ def _augment_with_master_data(
     if not master_id:
         print("[WARN] No LocationsMasterID relation found; skipping master lookups.")
         return
-    try:
-        if master_id in page_cache:
-            master_page = page_cache[master_id]
-        else:
-            master_page = nu.get_page(master_id)
-            page_cache[master_id] = master_page
-    except Exception as e:  # noqa: BLE001
-        print(f"[WARN] Could not fetch master page {master_id}: {e}")
+    errors = _prefetch_pages([master_id], page_cache)
+    if master_id not in page_cache:
+        print(f"[WARN] Could not fetch master page {master_id}: {errors.get(master_id)}")
         return
+    master_page = page_cache[master_id]
 
     mprops = master_page.get("properties", {})
     master_address = _get_rich_text(mprops, "Full Address") or _get_rich_text(mprops, "Address")
@@ -289,27 +367,17 @@ def _augment_with_master_data(
 
     ctx["google_maps_url"] = _get_url(mprops, "Google Maps URL") or ctx.get("google_maps_url", "")
 
-    # Facilities relations on the master page
-    def get_first(rel_name: str) -> Optional[str]:
-        ids = _get_relation_ids(mprops, rel_name)
-        return ids[0] if ids else None
-
-    uc1_id = get_first("UC1")
-    uc2_id = get_first("UC2")  # Optional
-    er_id = get_first("ER")
+    uc1_id, uc2_id, er_id = _facility_ids(master_page)
 
+    # Fetch the facility pages together rather than one round-trip at a time
+    errors = _prefetch_pages([uc1_id, uc2_id, er_id], page_cache)
     for key_prefix, page_id in (("uc1", uc1_id), ("uc2", uc2_id), ("er", er_id)):
         if not page_id:
             continue
-        try:
-            if page_id in page_cache:
-                fac_page = page_cache[page_id]
-            else:
-                fac_page = nu.get_page(page_id)
-                page_cache[page_id] = fac_page
-        except Exception as e:  # noqa: BLE001
-            print(f"[WARN] Could not fetch facility page {page_id}: {e}")
+        if page_id not in page_cache:
+            print(f"[WARN] Could not fetch facility page {page_id}: {errors.get(page_id)}")
             continue
+        fac_page = page_cache[page_id]
         details = _read_facility(fac_page)
         ctx[f"{key_prefix}_name"] = details.get("name", "")
         ctx[f"{key_prefix}_address"] = details.get("address", "")
@@ -326,15 +394,11 @@ def _augment_with_production_data(
 ) -> None:
     if not production_id:
         return
-    try:
-        if production_id in page_cache:
-            prod_page = page_cache[production_id]
-        else:
-            prod_page = nu.get_page(production_id)
-            page_cache[production_id] = prod_page
-    except Exception as e:  # noqa: BLE001
-        print(f"[WARN] Could not fetch production page {production_id}: {e}")
+    errors = _prefetch_pages([production_id], page_cache)
+    if production_id not in page_cache:
+        print(f"[WARN] Could not fetch production page {production_id}: {errors.get(production_id)}")
         return
+    prod_page = page_cache[production_id]
 
     props = prod_page.get("properties", {})
 
@@ -354,75 +418,114 @@ def _augment_with_production_data(
         ctx["production_abbrev"] = production_abbrev
 
 
-def _ensure_logs_file(log_path: Path) -> None:
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-    if not log_path.is_file():
-        with open(log_path, "w", newline="", encoding="utf-8-sig") as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                "timestamp",
-                "production_name",
-                "production_abbrev",
-                "location_page_id",
-                "location_name",
-                "practical_name",
-                "output_file",
-            ])
-
-
-def _render_and_save(ctx: Dict[str, Any], output_folder: Path, production_name: str) -> Path:
+LOG_FILE = project_root / "logs" / "lha_generation_log.csv"
+_LOG_HEADER = (
+    "timestamp",
+    "production_name",
+    "production_abbrev",
+    "location_page_id",
+    "location_name",
+    "practical_name",
+    "output_file",
+)
+
+
+class _GenerationLog:
+    """Appends rows to the LHA generation log, keeping the file open for the session."""
+
+    def __init__(self, log_path: Path) -> None:
+        self.path = log_path
+        self._file = None
+        self._writer = None
+
+    def __enter__(self) -> "_GenerationLog":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def write_row(self, row: List[str]) -> None:
+        if self._file is None:
+            # Opened on the first entry so a session that generates nothing leaves no file behind
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            is_new = not self.path.is_file()
+            self._file = open(self.path, "a", newline="", encoding="utf-8-sig")
+            self._writer = csv.writer(self._file)
+            if is_new:
+                self._writer.writerow(_LOG_HEADER)
+        self._writer.writerow(row)
+        # Flush (no fsync) so the entry survives a crash later in the session
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = self._writer = None
+
+
+def _check_renderer() -> None:
+    """Raise if a document could not be rendered, so run() can fail before any Notion calls."""
+    global DocxTemplate, RichText
     if DocxTemplate is None:
-        raise RuntimeError("docxtpl is not installed. Please install 'docxtpl' and retry.")
+        try:
+            from docxtpl import DocxTemplate, RichText
+        except Exception:  # noqa: BLE001
+            raise RuntimeError("docxtpl is not installed. Please install 'docxtpl' and retry.") from None
+    if not TEMPLATE_PATH.is_file():
+        raise FileNotFoundError(f"Template not found: {TEMPLATE_PATH}")
 
-    template_path = project_root / "templates" / "LHA_Template.docx"
-    if not template_path.is_file():
-        raise FileNotFoundError(f"Template not found: {template_path}")
 
-    # Derive filename
+def _output_filename(ctx: Dict[str, Any], production_name: str, suffix: str = "") -> str:
     abbrev = ctx.get("production_abbrev") or production_name
     safe_loc_name = _sanitize_filename(ctx.get("practical_name") or ctx.get("location_name") or "Location")
-    filename = f"{abbrev}_{safe_loc_name}_LHA.docx"
+    return f"{abbrev}_{safe_loc_name}{suffix}_LHA.docx"
+
+
+def _render_and_save(
+    ctx: Dict[str, Any],
+    output_folder: Path,
+    production_name: str,
+    filename: Optional[str] = None,
+) -> Path:
+    _check_renderer()
+    template_path = TEMPLATE_PATH
+
+    abbrev = ctx.get("production_abbrev") or production_name
+    if filename is None:
+        filename = _output_filename(ctx, production_name)
 
-    print("\nRendering document...")
     doc = DocxTemplate(str(template_path))
     # Prepare rendering context with defaults and hyperlinks
-    render_ctx: Dict[str, Any] = {}
-    for key, value in ctx.items():
-        if isinstance(value, (int, float)):
-            render_ctx[key] = value
-        else:
-            render_ctx[key] = "" if value is None else str(value)
+    # Context values are nearly all strings already; only coerce the rest
+    render_ctx: Dict[str, Any] = {
+        key: value if isinstance(value, (str, int, float)) else ("" if value is None else str(value))
+        for key, value in ctx.items()
+    }
 
     if not render_ctx.get("production_name"):
         render_ctx["production_name"] = production_name
     if not render_ctx.get("production_abbrev"):
         render_ctx["production_abbrev"] = abbrev
 
-    maps_url = ctx.get("google_maps_url")
-    if maps_url:
+    # Facilities often share a website or map link; register each URL with the document once
+    url_ids: Dict[str, str] = {}
+
+    def link(text: str, url: Any) -> Any:
+        if not url:
+            return ""
+        url = str(url)
+        if url not in url_ids:
+            url_ids[url] = doc.build_url_id(url)
         rt = RichText()
-        rt.add("Open in Google Maps", url_id=doc.build_url_id(str(maps_url)))
-        render_ctx["google_maps_link"] = rt
-    else:
-        render_ctx["google_maps_link"] = ""
+        rt.add(text, url_id=url_ids[url])
+        return rt
+
+    render_ctx["google_maps_link"] = link("Open in Google Maps", ctx.get("google_maps_url"))
 
     # Facility website hyperlinks if available
     for prefix in ("uc1", "uc2", "er"):
-        website = ctx.get(f"{prefix}_website")
-        if website:
-            rt_link = RichText()
-            rt_link.add("Website", url_id=doc.build_url_id(str(website)))
-            render_ctx[f"{prefix}_website_link"] = rt_link
-        else:
-            render_ctx[f"{prefix}_website_link"] = ""
-
-        maps_link = ctx.get(f"{prefix}_maps_url")
-        if maps_link:
-            rt_map = RichText()
-            rt_map.add("Map", url_id=doc.build_url_id(str(maps_link)))
-            render_ctx[f"{prefix}_maps_link"] = rt_map
-        else:
-            render_ctx[f"{prefix}_maps_link"] = ""
+        render_ctx[f"{prefix}_website_link"] = link("Website", ctx.get(f"{prefix}_website"))
+        render_ctx[f"{prefix}_maps_link"] = link("Map", ctx.get(f"{prefix}_maps_url"))
 
     doc.render(render_ctx)
 
@@ -435,9 +538,9 @@ def _render_and_save(ctx: Dict[str, Any], output_folder: Path, production_name:
 def _load_saved_paths() -> Dict[str, str]:
     if PATH_CACHE_FILE.is_file():
         try:
-            data = PATH_CACHE_FILE.read_text(encoding="utf-8-sig")
-            return json.loads(data)
-        except json.JSONDecodeError:
+            # Copy so run() can update its paths without touching the cached data
+            return dict(_cached_json(PATH_CACHE_FILE, encoding="utf-8-sig"))
+        except orjson.JSONDecodeError:
             print("[WARN] Failed to parse lha_paths.json; starting fresh.")
         except OSError as exc:
             print(f"[WARN] Could not read lha_paths.json: {exc}")
@@ -446,9 +549,14 @@ def _load_saved_paths() -> Dict[str, str]:
 
 def _persist_saved_paths(data: Dict[str, str]) -> None:
     try:
-        PATH_CACHE_FILE.write_text(json.dumps(data, indent=2), encoding="utf-8-sig")
+        PATH_CACHE_FILE.write_text(
+            orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8"), encoding="utf-8-sig"
+        )
     except Exception as exc:  # noqa: BLE001
         print(f"[WARN] Could not persist lha_paths.json: {exc}")
+    finally:
+        # A write within the mtime granularity could otherwise leave a stale entry
+        _JSON_CACHE.pop(PATH_CACHE_FILE, None)
 
 
 def run() -> None:
@@ -457,6 +565,11 @@ def run() -> None:
     if not Config.NOTION_TOKEN:
         print("[ERROR] NOTION_TOKEN is missing. Please configure your .env and retry.")
         return
+    try:
+        _check_renderer()
+    except (RuntimeError, FileNotFoundError) as e:
+        print(f"[ERROR] {e}")
+        return
 
     # 2) Load productions and prompt user
     table_map = _load_productions_map()
@@ -465,126 +578,129 @@ def run() -> None:
     saved_paths = _load_saved_paths()
     page_cache: Dict[str, Dict] = {}
 
-    prod_keys = list(table_map.keys())
-
-    while True:
-        print("\nSelect a production (Enter to cancel):")
-        prod_choice = _select_from_list(
-            "Available productions:",
-            prod_keys,
-            extra_options={
-                "m": "Return to main menu",
-            },
-        )
-        if prod_choice is None:
-            print("Cancelled.")
-            return
-        if isinstance(prod_choice, str):
-            if prod_choice == "m":
-                print("Returning to main menu.")
-                return
-            continue
-
-        selected_key = prod_keys[prod_choice]
-        db_id = table_map[selected_key]
-
-        # Derive production name/abbrev heuristically from key (e.g., 'AMCL_Locations')
-        if selected_key.endswith("_Locations"):
-            current_abbrev = selected_key.replace("_Locations", "")
-            current_name = current_abbrev
-        else:
-            current_name = selected_key
-            current_abbrev = selected_key
-
-        print(f"\nFetching locations for production: {selected_key} ({db_id})")
-        locations = _fetch_locations(db_id)
-        if not locations:
-            print("\nNo locations found for the selected production.")
-            continue
-
-        stored_path = saved_paths.get(current_abbrev)
-        default_out = stored_path or str(project_root / "output")
+    with _GenerationLog(LOG_FILE) as generation_log:
+        prod_keys = list(table_map.keys())
 
         while True:
-            labels = _display_locations(locations)
-            print("\nSelect a location to generate an LHA:")
-            loc_choice = _select_from_list(
-                "Available locations:",
-                labels,
+            print("\nSelect a production (Enter to cancel):")
+            prod_choice = _select_from_list(
+                "Available productions:",
+                prod_keys,
                 extra_options={
-                    "s": "Switch production",
                     "m": "Return to main menu",
                 },
             )
-            if loc_choice is None:
-                # Treat Enter as switch back to production menu
-                break
-            if isinstance(loc_choice, str):
-                if loc_choice == "s":
-                    break
-                if loc_choice == "m":
+            if prod_choice is None:
+                print("Cancelled.")
+                return
+            if isinstance(prod_choice, str):
+                if prod_choice == "m":
                     print("Returning to main menu.")
                     return
                 continue
 
-            selected_page = locations[loc_choice]
-            selected_label = labels[loc_choice]
-            print(f"\nSelected: {selected_label}")
-
-            # 3) Fetch detailed context
-            print("Fetching location details...")
-            ctx, master_id, production_page_id = _get_location_context(selected_page)
-            # If production_abbrev was empty from rollup, fallback to derived
-            if not ctx.get("production_abbrev"):
-                ctx["production_abbrev"] = current_abbrev
-            _augment_with_master_data(ctx, master_id, page_cache)
-            _augment_with_production_data(ctx, production_page_id, page_cache)
-
-            if ctx.get("production_name"):
-                current_name = ctx["production_name"]
-            if ctx.get("production_abbrev"):
-                current_abbrev = ctx["production_abbrev"]
-
-            if not ctx.get("latitude") or not ctx.get("longitude"):
-                print("[WARN] Location is missing latitude/longitude; template may show blanks.")
-            if not ctx.get("google_maps_url"):
-                print("[WARN] No Google Maps URL found for this location.")
-
-            # 4) Ask user for output folder
-            stored_path = saved_paths.get(current_abbrev)
-            if stored_path:
-                print(f"\nExisting path for {current_abbrev}: {stored_path}")
-                dest_str = input("Press Enter to reuse or type a new path: ").strip()
-            else:
-                print(f"\nEnter output folder for {current_abbrev} (default: {default_out}):")
-                dest_str = input("> ").strip()
-
-            output_folder = Path(dest_str) if dest_str else Path(default_out)
-            resolved_folder = str(output_folder)
-            if resolved_folder != saved_paths.get(current_abbrev):
-                saved_paths[current_abbrev] = resolved_folder
-                _persist_saved_paths(saved_paths)
-                print(f"[INFO] Saved output path for {current_abbrev}: {resolved_folder}")
-                default_out = resolved_folder
-            else:
-                print(f"[INFO] Using stored output path: {resolved_folder}")
+            selected_key = prod_keys[prod_choice]
+            db_id = table_map[selected_key]
 
-            try:
-                # 5) Render and save
-                output_path = _render_and_save(ctx, output_folder, current_name)
-                print(f"\n[OK] Document created: {output_path}")
-            except Exception as e:  # noqa: BLE001
-                print(f"\n[ERROR] Could not generate document: {e}")
+            current_name, current_abbrev = _derive_production_labels(selected_key)
+
+            print(f"\nFetching locations for production: {selected_key} ({db_id})")
+            locations = _fetch_locations(db_id)
+            if not locations:
+                print("\nNo locations found for the selected production.")
                 continue
 
-            # 6) Append to log
-            logs_dir = project_root / "logs"
-            log_file = logs_dir / "lha_generation_log.csv"
-            _ensure_logs_file(log_file)
-            try:
-                with open(log_file, "a", newline="", encoding="utf-8-sig") as f:
-                    writer = csv.writer(f)
-                    writer.writerow([
+            stored_path = saved_paths.get(current_abbrev)
+            default_out = stored_path or str(project_root / "output")
+
+            # Labels only change when the list is refreshed ([R])
+            labels = _display_locations(locations)
+            while True:
+                print("\nSelect a location to generate an LHA:")
+                loc_choice = _select_from_list(
+                    "Available locations:",
+                    labels,
+                    extra_options={
+                        "r": "Refresh list from Notion",
+                        "s": "Switch production",
+                        "m": "Return to main menu",
+                    },
+                )
+                if loc_choice is None:
+                    # Treat Enter as switch back to production menu
+                    break
+                if isinstance(loc_choice, str):
+                    if loc_choice == "r":
+                        # Also drop cached master/facility pages so edits made in Notion show up
+                        page_cache.clear()
+                        locations = _fetch_locations(db_id)
+                        if not locations:
+                            print("\nNo locations available after refresh; returning to production selection.")
+                            break
+                        labels = _display_locations(locations)
+                    if loc_choice == "s":
+                        break
+                    if loc_choice == "m":
+                        print("Returning to main menu.")
+                        return
+                    continue
+
+                selected_page = locations[loc_choice]
+                selected_label = labels[loc_choice]
+                print(f"\nSelected: {selected_label}")
+
+                # 3) Fetch detailed context
+                print("Fetching location details...")
+                ctx, master_id, production_page_id = _get_location_context(selected_page)
+                # If production_abbrev was empty from rollup, fallback to derived
+                if not ctx.get("production_abbrev"):
+                    ctx["production_abbrev"] = current_abbrev
+                # Master and production pages don't depend on each other; fetch both at once
+                _prefetch_pages([master_id, production_page_id], page_cache)
+                _augment_with_master_data(ctx, master_id, page_cache)
+                _augment_with_production_data(ctx, production_page_id, page_cache)
+
+                if ctx.get("production_name"):
+                    current_name = ctx["production_name"]
+                if ctx.get("production_abbrev"):
+                    current_abbrev = ctx["production_abbrev"]
+
+                if not ctx.get("latitude") or not ctx.get("longitude"):
+                    print("[WARN] Location is missing latitude/longitude; template may show blanks.")
+                if not ctx.get("google_maps_url"):
+                    print("[WARN] No Google Maps URL found for this location.")
+
+                # 4) Ask user for output folder
+                stored_path = saved_paths.get(current_abbrev)
+                if stored_path:
+                    print(f"\nExisting path for {current_abbrev}: {stored_path}")
+                    dest_str = input("Press Enter to reuse or type a new path: ").strip()
+                else:
+                    print(f"\nEnter output folder for {current_abbrev} (default: {default_out}):")
+                    dest_str = input("> ").strip()
+
+                output_folder = Path(dest_str) if dest_str else Path(default_out)
+                resolved_folder = str(output_folder)
+                if resolved_folder != saved_paths.get(current_abbrev):
+                    saved_paths[current_abbrev] = resolved_folder
+                    _persist_saved_paths(saved_paths)
+                    print(f"[INFO] Saved output path for {current_abbrev}: {resolved_folder}")
+                    default_out = resolved_folder
+                else:
+                    print(f"[INFO] Using stored output path: {resolved_folder}")
+
+                try:
+                    # 5) Render and save
+                    print("\nRendering document...")
+                    output_path = _render_and_save(ctx, output_folder, current_name)
+                    print(f"\n[OK] Document created: {output_path}")
+                except Exception as e:  # noqa: BLE001
+                    print(f"\n[ERROR] Could not generate document: {e}")
+                    continue
+
+                # 6) Append to log
+                try:
+                    generation_log.write_row([
                         datetime.utcnow().isoformat(timespec="seconds"),
                         current_name,
                         ctx.get("production_abbrev", ""),
@@ -593,15 +709,126 @@ def run() -> None:
                         ctx.get("practical_name", ""),
                         str(output_path),
                     ])
-                print(f"[LOG] Appended entry to {log_file}")
+                    print(f"[LOG] Appended entry to {generation_log.path}")
+                except Exception as e:  # noqa: BLE001
+                    print(f"[WARN] Could not write log entry: {e}")
+
+
+def run_batch(
+    production_key: str,
+    location_ids: Sequence[str],
+    output_folder: Optional[Path] = None,
+) -> List[Path]:
+    """
+    Generate LHAs for several locations of one production without prompting.
+
+    Pages are fetched concurrently and the documents rendered on a thread pool;
+    log entries are written once all renders finish. Output goes to
+    `output_folder`, else the production's saved path, else `output/`.
+    Returns the paths of the documents created.
+    """
+    Config.setup()
+    if not Config.NOTION_TOKEN:
+        print("[ERROR] NOTION_TOKEN is missing. Please configure your .env and retry.")
+        return []
+    try:
+        _check_renderer()
+    except (RuntimeError, FileNotFoundError) as e:
+        print(f"[ERROR] {e}")
+        return []
+
+    table_map = _load_productions_map()
+    if production_key not in table_map:
+        print(f"[ERROR] Unknown production '{production_key}' (not in notion_tables.json).")
+        return []
+    default_name, default_abbrev = _derive_production_labels(production_key)
+    if output_folder is None:
+        output_folder = Path(_load_saved_paths().get(default_abbrev) or project_root / "output")
+
+    # 1) Fetch the location pages, then every master/production page they link to
+    page_cache: Dict[str, Dict] = {}
+    location_ids = list(dict.fromkeys(location_ids))
+    errors = _prefetch_pages(location_ids, page_cache)
+    jobs: List[Tuple[dict, Dict[str, Any], Optional[str], Optional[str]]] = []
+    for page_id in location_ids:
+        if page_id not in page_cache:
+            print(f"[WARN] Could not fetch location page {page_id}: {errors.get(page_id)}")
+            continue
+        page = page_cache[page_id]
+        jobs.append((page, *_get_location_context(page)))
+    _prefetch_pages([pid for _, _, master_id, prod_id in jobs for pid in (master_id, prod_id)], page_cache)
+
+    # Locations often share masters and nearby facilities; fetch every facility once, up front
+    _prefetch_pages(
+        [
+            fid
+            for _, _, master_id, _ in jobs
+            if master_id in page_cache
+            for fid in _facility_ids(page_cache[master_id])
+        ],
+        page_cache,
+    )
+
+    # 2) Build contexts from the shared cache
+    renders: List[Tuple[dict, Dict[str, Any], str]] = []
+    for page, ctx, master_id, production_page_id in jobs:
+        if not ctx.get("production_abbrev"):
+            ctx["production_abbrev"] = default_abbrev
+        _augment_with_master_data(ctx, master_id, page_cache)
+        _augment_with_production_data(ctx, production_page_id, page_cache)
+        renders.append((page, ctx, ctx.get("production_name") or default_name))
+    if not renders:
+        return []
+
+    # Locations that share a name would render to the same file from two threads;
+    # number the repeats so every document gets its own path
+    filenames: List[str] = []
+    taken: Set[str] = set()
+    for _, ctx, name in renders:
+        filename = _output_filename(ctx, name)
+        n = 1
+        while filename.casefold() in taken:  # Windows/macOS paths ignore case
+            n += 1
+            filename = _output_filename(ctx, name, suffix=f"_{n}")
+        taken.add(filename.casefold())
+        filenames.append(filename)
+
+    # 3) Render concurrently (each render builds its own DocxTemplate)
+    print(f"\nRendering {len(renders)} document(s)...")
+    created: List[Tuple[dict, Dict[str, Any], str, Path]] = []
+    with ThreadPoolExecutor(max_workers=min(MAX_RENDER_WORKERS, len(renders))) as executor:
+        futures = {
+            executor.submit(_render_and_save, ctx, output_folder, name, filename): (page, ctx, name)
+            for (page, ctx, name), filename in zip(renders, filenames)
+        }
+        for future in as_completed(futures):
+            page, ctx, name = futures[future]
+            try:
+                output_path = future.result()
             except Exception as e:  # noqa: BLE001
-                print(f"[WARN] Could not write log entry: {e}")
+                print(f"[ERROR] Could not generate document for {page.get('id', '')}: {e}")
+                continue
+            print(f"[OK] Document created: {output_path}")
+            created.append((page, ctx, name, output_path))
 
-            # Refresh location list before next iteration in case Notion data changed
-            locations = _fetch_locations(db_id)
-            if not locations:
-                print("\nNo locations available after refresh; returning to production selection.")
-                break
+    # 4) Log every document in one pass
+    if created:
+        try:
+            with _GenerationLog(LOG_FILE) as generation_log:
+                for page, ctx, name, output_path in created:
+                    generation_log.write_row([
+                        datetime.utcnow().isoformat(timespec="seconds"),
+                        name,
+                        ctx.get("production_abbrev", ""),
+                        page.get("id", ""),
+                        ctx.get("location_name", ""),
+                        ctx.get("practical_name", ""),
+                        str(output_path),
+                    ])
+            print(f"[LOG] Appended {len(created)} entries to {LOG_FILE}")
+        except Exception as e:  # noqa: BLE001
+            print(f"[WARN] Could not write log entries: {e}")
+    return [output_path for *_, output_path in created]
 
 
 if __name__ == "__main__":
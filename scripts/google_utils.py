@@ -3,7 +3,6 @@ import sys
 import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional
-import re
 
 import requests
 
@@ -11,6 +10,7 @@ import requests
 project_root = Path(__file__).resolve().parents[1]
 sys.path.append(str(project_root))
 from config import Config
+from scripts._address_norm import normalize_address
 
 # ─── GOOGLE API HELPERS ───────────────────────────────────────────────────────
 
@@ -40,13 +40,7 @@ def _make_google_request(url: str, params: Dict, api_key: str, max_retries: int
 def _normalize_formatted_address(value: Optional[str]) -> Optional[str]:
     if not value:
         return value
-    text = value.strip()
-    if not text:
-        return text
-    text = re.sub(r"\s+", " ", text)
-    text = re.sub(r",\s*(USA|United States)$", "", text, flags=re.IGNORECASE)
-    text = re.sub(r",\s*$", "", text)
-    return text.strip()
+    return normalize_address(value)
 
 
 def geocode(address: str) -> Optional[Dict[str, Any]]:
@@ -9,10 +9,10 @@ strips the redundant weekday prefix so the value is just "8:00 AM – 8:00 PM".
 from __future__ import annotations
 
 import argparse
-import re
+import asyncio
 import sys
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Set, Tuple
 
 from dotenv import load_dotenv
 
@@ -25,75 +25,150 @@ from scripts import notion_utils as nu
 from scripts.fetch_medical_facilities import DAY_TO_PROP
 
 
-PREFIX_PATTERN_TEMPLATE = r"^{day}\s*[:\-–—]\s*"
+MAX_WORKERS = 6  # concurrent Notion updates
+MAX_PENDING = 64  # queued page updates before we wait for some to finish
+
+# Separators allowed between a weekday prefix and the hours ("Tuesday: ...", "Tuesday – ...")
+_PREFIX_SEPARATORS = frozenset(":-–—")
+# (lowercase day, property) pairs checked on every page
+_DAY_PROP_ITEMS = tuple((day.lower(), prop_name) for day, prop_name in DAY_TO_PROP.items())
+_HOUR_PROPS = frozenset(DAY_TO_PROP.values())
+# Only pages with a weekday name in one of their own hour fields can need a fix; Notion's
+# text filters ignore case, so this also catches "monday:" / "MONDAY -" prefixes
+_CANDIDATE_FILTER = {
+    "or": [{"property": prop_name, "rich_text": {"contains": day}} for day, prop_name in DAY_TO_PROP.items()]
+}
 
 
 def _get_rich_text(props: Dict, key: str) -> str:
     """Safely pull the first rich_text value."""
-    arr = props.get(key, {}).get("rich_text", [])
+    prop = props.get(key)
+    arr = prop.get("rich_text") if prop else None
     return arr[0].get("plain_text", "") if arr else ""
 
 
 def _get_title(props: Dict, key: str) -> str:
     """Retrieve the first title field for logging."""
-    arr = props.get(key, {}).get("title", [])
+    prop = props.get(key)
+    arr = prop.get("title") if prop else None
     return arr[0].get("plain_text", "") if arr else ""
 
 
 def _normalize_hours(day: str, value: str) -> str:
-    """Remove a leading weekday prefix if present."""
+    """Remove a leading weekday prefix if present; `day` is the lowercase weekday name."""
     stripped = value.strip()
     if not stripped:
         return value
 
-    pattern = re.compile(PREFIX_PATTERN_TEMPLATE.format(day=re.escape(day)), re.IGNORECASE)
-    normalized = pattern.sub("", stripped, count=1).strip()
-    return normalized if normalized != value else normalized
-
+    # Most values carry no weekday prefix; only look further if the text starts with the day
+    if stripped[:len(day)].lower() != day:
+        return stripped
+    # The prefix is fixed ("<day> <sep> "), so scan it by hand rather than with a regex
+    i, end = len(day), len(stripped)
+    while i < end and stripped[i].isspace():
+        i += 1
+    if i == end or stripped[i] not in _PREFIX_SEPARATORS:
+        return stripped
+    return stripped[i + 1:].strip()
+
+
+def _page_changes(props: Dict, *, record: bool = False) -> Tuple[Dict[str, Dict], Dict[str, tuple[str, str]]]:
+    """
+    Returns (property payload, {property: (before, after)}) for the hour fields that need fixing.
+    The before/after map is only filled when `record` is set (dry runs print it).
+    """
+    updates: Dict[str, Dict] = {}
+    per_day_changes: Dict[str, tuple[str, str]] = {}
+    if _HOUR_PROPS.isdisjoint(props):
+        return updates, per_day_changes
+
+    for day, prop_name in _DAY_PROP_ITEMS:
+        existing = _get_rich_text(props, prop_name)
+        if not existing:
+            continue
 
-def normalize_facility_hours(*, dry_run: bool = False) -> None:
-    """Iterate every facility page and normalize weekday hour fields."""
-    if not Config.MEDICAL_FACILITIES_DB:
-        print("[ERROR] MEDICAL_FACILITIES_DB is not configured.")
-        return
+        normalized = _normalize_hours(day, existing)
+        if normalized != existing:
+            updates[prop_name] = nu.format_rich_text(normalized)
+            if record:
+                per_day_changes[prop_name] = (existing, normalized)
+    return updates, per_day_changes
 
-    facility_pages = nu.query_database(Config.MEDICAL_FACILITIES_DB)
-    if not facility_pages:
-        print("[INFO] No facility pages found.")
-        return
 
+async def _normalize_pages(db_id: str, dry_run: bool, full_scan: bool) -> Tuple[int, int, int, bool]:
+    """
+    Stream the facility pages and update each changed page as it is found.
+    Returns (pages changed, fields changed, failed updates, any pages seen).
+    """
     updated_pages = 0
     total_fields = 0
-
-    for page in facility_pages:
-        props = page.get("properties", {})
-        updates: Dict[str, Dict] = {}
-        per_day_changes: Dict[str, tuple[str, str]] = {}
-
-        for day, prop_name in DAY_TO_PROP.items():
-            existing = _get_rich_text(props, prop_name)
-            if not existing:
+    failed = 0
+    seen_any = False
+
+    async def update(client, sem: asyncio.Semaphore, page_id: str, title: str, updates: Dict[str, Dict]) -> bool:
+        try:
+            async with sem:
+                await nu.update_page_async(client, page_id, updates)
+            return True
+        except Exception as exc:  # noqa: BLE001
+            print(f"[WARN] Failed to update {title}: {exc}")
+            return False
+
+    def _record(done) -> None:
+        nonlocal failed
+        failed += sum(1 for task in done if not task.result())
+
+    # One pooled connection; the semaphore keeps us within Notion's rate limits.
+    sem = asyncio.Semaphore(MAX_WORKERS)
+    pending: Set[asyncio.Task] = set()
+    async with nu.async_client() as client:
+        # Updates start while later result pages are still being fetched.
+        filter_payload = None if full_scan else _CANDIDATE_FILTER
+        async for page in nu.iter_query_database_async(client, db_id, filter_payload):
+            seen_any = True
+            props = page.get("properties", {})
+            updates, per_day_changes = _page_changes(props, record=dry_run)
+            if not updates:
                 continue
 
-            normalized = _normalize_hours(day, existing)
-            if normalized != existing:
-                updates[prop_name] = nu.format_rich_text(normalized)
-                per_day_changes[prop_name] = (existing, normalized)
-
-        if not updates:
-            continue
+            updated_pages += 1
+            total_fields += len(updates)
+            title = _get_title(props, "MedicalFacilityID") or page.get("id", "")
 
-        updated_pages += 1
-        total_fields += len(updates)
-        title = _get_title(props, "MedicalFacilityID") or page.get("id", "")
+            if dry_run:
+                # One write per page rather than one per changed field
+                lines = [f"[DRY-RUN] {title}:"]
+                lines.extend(f"  - {prop_name}: '{before}' -> '{after}'" for prop_name, (before, after) in per_day_changes.items())
+                print("\n".join(lines))
+                continue
 
-        if dry_run:
-            print(f"[DRY-RUN] {title}:")
-            for prop_name, (before, after) in per_day_changes.items():
-                print(f"  - {prop_name}: '{before}' -> '{after}'")
-            continue
+            pending.add(asyncio.ensure_future(update(client, sem, page["id"], title, updates)))
+            if len(pending) >= MAX_PENDING:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                _record(done)
+        if pending:
+            done, _ = await asyncio.wait(pending)
+            _record(done)
+    return updated_pages, total_fields, failed, seen_any
+
+
+def normalize_facility_hours(*, dry_run: bool = False, full_scan: bool = False) -> None:
+    """
+    Normalize weekday hour fields on the facility pages that mention a weekday.
+    With `full_scan`, every page is checked (which also trims stray whitespace).
+    """
+    if not Config.MEDICAL_FACILITIES_DB:
+        print("[ERROR] MEDICAL_FACILITIES_DB is not configured.")
+        return
 
-        nu.update_page(page["id"], updates)
+    updated_pages, total_fields, failed, seen_any = asyncio.run(
+        _normalize_pages(Config.MEDICAL_FACILITIES_DB, dry_run, full_scan)
+    )
+    if not seen_any:
+        print("[INFO] No facility pages found." if full_scan else "[INFO] No facility hours with weekday prefixes found.")
+        return
+    if failed:
+        print(f"[WARN] {failed} facility page update(s) failed.")
 
     mode_label = "(dry-run)" if dry_run else ""
     print(f"[INFO] Normalized {total_fields} hour field(s) across {updated_pages} facility page(s) {mode_label}".strip())
@@ -102,12 +177,17 @@ def normalize_facility_hours(*, dry_run: bool = False) -> None:
 def main() -> None:
     parser = argparse.ArgumentParser(description="Normalize facility opening hours to drop weekday prefixes.")
     parser.add_argument("--dry-run", action="store_true", help="Show changes without updating Notion.")
+    parser.add_argument(
+        "--full-scan",
+        action="store_true",
+        help="Check every facility page, not just those whose hours mention a weekday.",
+    )
     args = parser.parse_args()
 
     load_dotenv(dotenv_path=project_root / ".env")
     Config.setup()
 
-    normalize_facility_hours(dry_run=args.dry_run)
+    normalize_facility_hours(dry_run=args.dry_run, full_scan=args.full_scan)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import time
 import random
@@ -5,8 +6,10 @@ import json
 import logging
 import sys
 from pathlib import Path
-from typing import Any, Optional, List
+from typing import Any, AsyncIterator, Iterator, Optional, List
 
+import httpx
+import orjson
 import requests
 
 # Add project root to path and import central config
@@ -16,16 +19,58 @@ from config import Config
 
 # ─── CORE API FUNCTIONS ─────────────────────────────────────────────────────
 
-def _make_request(method: str, url: str, max_retries: int = 3, backoff_factor: float = 0.5, **kwargs: Any) -> requests.Response:
-    """
-    A wrapper for requests that includes automatic retries on transient errors.
-    """
-    # Generate headers dynamically at request time to ensure Config is loaded.
-    headers = {
+MAX_RETRIES = 5
+MAX_BACKOFF_SECONDS = 30.0
+
+def _retry_delay(attempt: int, backoff_factor: float, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before the next attempt: Notion's Retry-After if sent, else jittered exponential backoff."""
+    if retry_after:
+        try:
+            return min(float(retry_after), MAX_BACKOFF_SECONDS)
+        except ValueError:
+            pass
+    return min(backoff_factor * (2 ** attempt) + random.uniform(0, 1), MAX_BACKOFF_SECONDS)
+
+def _headers() -> dict:
+    return {
         "Authorization": f"Bearer {Config.NOTION_TOKEN}",
         "Notion-Version": "2022-06-28",
         "Content-Type": "application/json"
     }
+
+def _json(res: Any) -> Any:
+    """
+    Decodes a requests/httpx response body; orjson is much faster than `.json()` on large Notion pages.
+    A body that isn't JSON (e.g. a proxy's HTML error page) raises the client's own error type, so
+    callers catching `requests.exceptions.RequestException` / `httpx.HTTPError` still handle it.
+    """
+    try:
+        return orjson.loads(res.content)
+    except orjson.JSONDecodeError as exc:
+        if isinstance(res, httpx.Response):
+            raise httpx.DecodingError(f"Invalid JSON in Notion response: {exc}", request=res.request) from exc
+        raise requests.exceptions.JSONDecodeError(exc.msg, exc.doc, exc.pos, response=res) from exc
+
+# One pooled keep-alive session per process, so consecutive calls (and the
+# thread pools in the bulk scripts) reuse TLS connections to api.notion.com.
+_SESSION: Optional[requests.Session] = None
+
+def _session() -> requests.Session:
+    global _SESSION
+    if _SESSION is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=16)
+        session.mount("https://", adapter)
+        _SESSION = session
+    return _SESSION
+
+def _make_request(method: str, url: str, max_retries: int = MAX_RETRIES, backoff_factor: float = 0.5, **kwargs: Any) -> requests.Response:
+    """
+    A wrapper for requests that includes automatic retries on transient errors
+    (timeouts, connection errors, 5xx) and rate limiting (429).
+    """
+    # Generate headers dynamically at request time to ensure Config is loaded.
+    headers = _headers()
     # Allow for overriding or adding headers from the function call
     headers.update(kwargs.get("headers", {}))
     kwargs["headers"] = headers
@@ -33,19 +78,22 @@ def _make_request(method: str, url: str, max_retries: int = 3, backoff_factor: f
 
     for attempt in range(max_retries):
         try:
-            res = requests.request(method, url, **kwargs)
+            res = _session().request(method, url, **kwargs)
             res.raise_for_status()  # Raises HTTPError for 4xx/5xx responses
             return res
         except requests.exceptions.RequestException as e:
-            # Retry on server errors (5xx) and timeouts/connection errors
-            is_server_error = hasattr(e, 'response') and e.response is not None and 500 <= e.response.status_code < 600
+            # Retry on rate limiting (429), server errors (5xx) and timeouts/connection errors
+            response = getattr(e, 'response', None)
+            is_server_error = response is not None and 500 <= response.status_code < 600
+            is_rate_limited = response is not None and response.status_code == 429
             is_timeout = isinstance(e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError))
 
-            if is_server_error or is_timeout:
+            if is_server_error or is_rate_limited or is_timeout:
                 if attempt + 1 == max_retries:
                     logging.error(f"Max retries reached for {method} {url}. Last error: {e}")
                     raise
-                sleep_time = backoff_factor * (2 ** attempt) + random.uniform(0, 1)
+                retry_after = response.headers.get("Retry-After") if is_rate_limited else None
+                sleep_time = _retry_delay(attempt, backoff_factor, retry_after)
                 logging.warning(f"Network error ({e}). Retrying in {sleep_time:.2f}s... ({attempt + 1}/{max_retries})")
                 time.sleep(sleep_time)
             else:
@@ -60,62 +108,71 @@ def _make_request(method: str, url: str, max_retries: int = 3, backoff_factor: f
                 raise # Re-raise non-retryable client errors
     raise RuntimeError("Request failed after all retries.") # Should be unreachable
 
-def query_database(database_id: str, filter_payload: Optional[dict] = None) -> list[dict]:
+def iter_query_database(database_id: str, filter_payload: Optional[dict] = None, sorts: Optional[list] = None, page_size: int = 100) -> Iterator[dict]:
     """
-    Queries a Notion database, handling pagination automatically.
-    Returns a list of all page results.
+    Queries a Notion database, yielding each page as its result batch arrives.
+    Stops early (after logging) if a pagination request fails. Batches are only
+    requested as the caller iterates, so `next(...)` costs a single request.
     """
     url = f"https://api.notion.com/v1/databases/{database_id}/query"
-    all_results = []
     next_cursor = None
     while True:
-        payload = {"page_size": 100}
+        payload = {"page_size": page_size}
         if filter_payload:
             payload["filter"] = filter_payload
+        if sorts:
+            payload["sorts"] = sorts
         if next_cursor:
             payload["start_cursor"] = next_cursor
 
         try:
             res = _make_request("POST", url, json=payload)
-            data = res.json()
-            all_results.extend(data.get("results", []))
-            if not data.get("has_more"):
-                return all_results
-            next_cursor = data.get("next_cursor")
+            data = _json(res)
         except requests.exceptions.RequestException as e:
             logging.error(f"Error querying database {database_id}: {e}")
-            return all_results # Return what we have so far
+            return # Caller keeps what it has so far
+        yield from data.get("results", [])
+        if not data.get("has_more"):
+            return
+        next_cursor = data.get("next_cursor")
+
+def query_database(database_id: str, filter_payload: Optional[dict] = None) -> list[dict]:
+    """
+    Queries a Notion database, handling pagination automatically.
+    Returns a list of all page results.
+    """
+    return list(iter_query_database(database_id, filter_payload))
 
 def get_page(page_id: str) -> dict:
     """Retrieves a single Notion page."""
     url = f"https://api.notion.com/v1/pages/{page_id}"
     res = _make_request("GET", url)
-    return res.json()
+    return _json(res)
 
 def get_database(database_id: str) -> dict:
     """Retrieves a database object."""
     url = f"https://api.notion.com/v1/databases/{database_id}"
     res = _make_request("GET", url)
-    return res.json()
+    return _json(res)
 
 def update_page(page_id: str, properties_payload: dict) -> dict:
     """Updates a Notion page with the given properties."""
     url = f"https://api.notion.com/v1/pages/{page_id}"
     res = _make_request("PATCH", url, json={"properties": properties_payload})
-    return res.json()
+    return _json(res)
 
 def update_database(database_id: str, properties_payload: dict) -> dict:
     """Updates a database's properties (e.g., adding a select option)."""
     url = f"https://api.notion.com/v1/databases/{database_id}"
     res = _make_request("PATCH", url, json=properties_payload)
-    return res.json()
+    return _json(res)
 
 def create_database(parent_page_id: str, title: list, schema: dict, is_inline: bool = False) -> dict:
     """Creates a new database as a sub-page of a given page."""
     url = "https://api.notion.com/v1/databases"
     payload = {"parent": {"page_id": parent_page_id}, "title": title, "properties": schema, "is_inline": is_inline}
     res = _make_request("POST", url, json=payload)
-    return res.json()
+    return _json(res)
 
 def create_page(parent_db_id: str, properties_payload: dict, extra_payload: Optional[dict] = None) -> dict:
     """Creates a new page in the specified database."""
@@ -134,13 +191,79 @@ def create_page(parent_db_id: str, properties_payload: dict, extra_payload: Opti
             payload["properties"] = extra_payload.pop("properties")
 
     res = _make_request("POST", url, json=payload)
-    return res.json()
+    return _json(res)
 
 def archive_page(page_id: str) -> dict:
     """Archives (deletes) a Notion page."""
     url = f"https://api.notion.com/v1/pages/{page_id}"
     res = _make_request("PATCH", url, json={"archived": True})
-    return res.json()
+    return _json(res)
+
+# ─── ASYNC API FUNCTIONS ────────────────────────────────────────────────────
+# For bulk jobs: one AsyncClient keeps a pooled keep-alive connection, and the
+# caller bounds concurrency (Notion averages ~3 requests/second per token).
+
+def async_client(**kwargs: Any) -> httpx.AsyncClient:
+    """Returns an AsyncClient preconfigured for Notion; use as `async with nu.async_client() as client`."""
+    kwargs.setdefault("timeout", 15)
+    return httpx.AsyncClient(headers=_headers(), **kwargs)
+
+async def _make_request_async(client: httpx.AsyncClient, method: str, url: str, max_retries: int = MAX_RETRIES, backoff_factor: float = 0.5, **kwargs: Any) -> httpx.Response:
+    """Async counterpart of `_make_request` with the same retry policy."""
+    for attempt in range(max_retries):
+        try:
+            res = await client.request(method, url, **kwargs)
+            res.raise_for_status()
+            return res
+        except (httpx.HTTPStatusError, httpx.TransportError) as e:
+            response = getattr(e, "response", None) if isinstance(e, httpx.HTTPStatusError) else None
+            is_server_error = response is not None and 500 <= response.status_code < 600
+            is_rate_limited = response is not None and response.status_code == 429
+            if (is_server_error or is_rate_limited or response is None) and attempt + 1 < max_retries:
+                retry_after = response.headers.get("Retry-After") if is_rate_limited else None
+                sleep_time = _retry_delay(attempt, backoff_factor, retry_after)
+                logging.warning(f"Network error ({e}). Retrying in {sleep_time:.2f}s... ({attempt + 1}/{max_retries})")
+                await asyncio.sleep(sleep_time)
+                continue
+            if response is not None and not (is_server_error or is_rate_limited):
+                try:
+                    logging.error(f"Notion API Error: {response.json().get('message')}")
+                except (json.JSONDecodeError, AttributeError):
+                    logging.error(f"Notion API Error: {response.status_code} {response.reason_phrase}. Response: {response.text}")
+                logging.error(f"Request body: {json.dumps(kwargs.get('json')) if kwargs.get('json') else 'None'}")
+            else:
+                logging.error(f"Max retries reached for {method} {url}. Last error: {e}")
+            raise
+    raise RuntimeError("Request failed after all retries.") # Should be unreachable
+
+async def iter_query_database_async(client: httpx.AsyncClient, database_id: str, filter_payload: Optional[dict] = None) -> AsyncIterator[dict]:
+    """Async `iter_query_database` over a shared client."""
+    url = f"https://api.notion.com/v1/databases/{database_id}/query"
+    next_cursor = None
+    while True:
+        payload = {"page_size": 100}
+        if filter_payload:
+            payload["filter"] = filter_payload
+        if next_cursor:
+            payload["start_cursor"] = next_cursor
+
+        try:
+            res = await _make_request_async(client, "POST", url, json=payload)
+            data = _json(res)
+        except httpx.HTTPError as e:
+            logging.error(f"Error querying database {database_id}: {e}")
+            return
+        for page in data.get("results", []):
+            yield page
+        if not data.get("has_more"):
+            return
+        next_cursor = data.get("next_cursor")
+
+async def update_page_async(client: httpx.AsyncClient, page_id: str, properties_payload: dict) -> dict:
+    """Async `update_page` over a shared client."""
+    url = f"https://api.notion.com/v1/pages/{page_id}"
+    res = await _make_request_async(client, "PATCH", url, json={"properties": properties_payload})
+    return _json(res)
 
 # ─── FORMATTING HELPERS ─────────────────────────────────────────────────────
 
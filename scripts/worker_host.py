@@ -0,0 +1,119 @@
+# scripts/worker_host.py
+"""
+Long-lived host process that runs scripts on demand for the web app.
+
+The host imports the `scripts` package once, then reads one JSON job per line
+from stdin (`{"module": "scripts.x", "args": [...], "input": "..."}`) and runs
+the module as `__main__`, exactly as `python -m scripts.x` would. Output is
+streamed back on stdout as JSON lines:
+
+- `{"out": "..."}` / `{"err": "..."}` for stdout/stderr text
+- `{"done": <returncode>}` once the job has finished
+
+Used by `app/services/_workerpool.py`; not meant to be run by hand.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import runpy
+import sys
+import threading
+import traceback
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+from config import Config
+import scripts  # noqa: F401  (warm the shared imports once)
+
+_PROTOCOL_OUT = sys.__stdout__
+_EMIT_LOCK = threading.Lock()
+
+
+def _emit(frame: dict) -> None:
+    with _EMIT_LOCK:
+        _PROTOCOL_OUT.write(json.dumps(frame) + "\n")
+        _PROTOCOL_OUT.flush()
+
+
+class _FrameWriter(io.TextIOBase):
+    """Text stream that forwards complete lines to the parent as frames."""
+
+    def __init__(self, channel: str) -> None:
+        self._channel = channel
+        self._buffer = ""
+        self._lock = threading.Lock()
+
+    @property
+    def encoding(self) -> str:
+        return "utf-8"
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        with self._lock:
+            self._buffer += text
+            if "\n" in self._buffer:
+                complete, _, self._buffer = self._buffer.rpartition("\n")
+                _emit({self._channel: complete + "\n"})
+        return len(text)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._buffer:
+                _emit({self._channel: self._buffer})
+                self._buffer = ""
+
+
+def _exit_code(exc: SystemExit) -> int:
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    print(exc.code, file=sys.stderr)
+    return 1
+
+
+def _run_job(job: dict) -> int:
+    out, err = _FrameWriter("out"), _FrameWriter("err")
+    # Logging handlers created at import time still point at the real streams.
+    redirected = []
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, logging.StreamHandler) and handler.stream in (sys.__stdout__, sys.__stderr__):
+            redirected.append((handler, handler.setStream(out if handler.stream is sys.__stdout__ else err)))
+
+    saved = sys.argv, sys.stdin, sys.stdout, sys.stderr
+    sys.argv = [job["module"], *job.get("args", [])]
+    sys.stdin = io.StringIO(job.get("input") or "")
+    sys.stdout, sys.stderr = out, err
+    try:
+        Config.setup()  # picks up .env edits since the last job
+        runpy.run_module(job["module"], run_name="__main__", alter_sys=True)
+        returncode = 0
+    except SystemExit as exc:
+        returncode = _exit_code(exc)
+    except BaseException:
+        traceback.print_exc()
+        returncode = 1
+    finally:
+        out.flush()
+        err.flush()
+        sys.argv, sys.stdin, sys.stdout, sys.stderr = saved
+        for handler, stream in redirected:
+            handler.setStream(stream)
+    return returncode
+
+
+def main() -> None:
+    for raw in sys.stdin:
+        if not raw.strip():
+            continue
+        _emit({"done": _run_job(json.loads(raw))})
+
+
+if __name__ == "__main__":
+    main()